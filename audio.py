@@ -0,0 +1,97 @@
+import os
+import time
+import statistics
+
+import pygame
+
+FREQUENCY = 44100
+SIZE = -16
+CHANNELS = 2
+# Amostras por bloco do mixer: cada bloco é atraso entre o toque e o som
+# (256 a 44,1 kHz ≈ 6 ms). Ajustável por AUDIO_BUFFER no ambiente, que
+# também chega aos processos isolados dos jogos.
+BUFFER = int(os.environ.get("AUDIO_BUFFER", "256"))
+MIXER_CHANNELS = 16
+
+# Canais dedicados, na ordem: um por cor e um para o fim de jogo. Um som
+# novo corta o anterior do mesmo canal em vez de esperar um canal livre.
+RESERVED = ("yellow", "red", "blue", "green", "game_over")
+
+LATENCY_ROUNDS = 8
+
+# Vale para o próximo mixer.init(), inclusive o de pygame.init(): importe
+# este módulo antes de inicializar o pygame
+pygame.mixer.pre_init(FREQUENCY, SIZE, CHANNELS, BUFFER)
+
+ready = None  # None = ainda não tentou; False = sem áudio
+latency = 0.0  # atraso de saída medido em init(), em segundos
+block = 0  # amostras por bloco do mixer, medido em init()
+# Simulação sem tela (ver Game.headless): nada toca e os tons nem são
+# sintetizados. Vale para o processo inteiro.
+muted = False
+
+
+def init():
+    """Inicializa o mixer uma vez por processo, reserva os canais e mede o
+    atraso de saída. Devolve False se não houver áudio."""
+    global ready, latency, block
+    if ready is not None:
+        return ready
+
+    ready = False
+    try:
+        if not pygame.mixer.get_init():
+            pygame.mixer.init()
+    except pygame.error as e:
+        print(f"Aviso: pygame.mixer não pôde ser inicializado ({e}). Áudio pode não funcionar.")
+        return False
+
+    pygame.mixer.set_num_channels(MIXER_CHANNELS)
+    pygame.mixer.set_reserved(len(RESERVED))
+    latency, block = measure_latency()
+    frequency, _, _ = pygame.mixer.get_init()
+    print(f"Audio: {frequency} Hz, buffer ~{block} samples (requested {BUFFER}), "
+          f"output latency {latency * 1000:.1f} ms")
+    ready = True
+    return True
+
+
+def measure_latency(rounds=LATENCY_ROUNDS):
+    """Devolve (atraso de saída em segundos, bloco em amostras) medidos no
+    mixer aberto. Toca um trecho curto de silêncio várias vezes seguidas:
+    cada um termina no próximo bloco que o mixer processa, então o intervalo
+    entre os fins é o bloco de verdade (que pode não ser BUFFER, se o mixer
+    foi aberto antes do pre_init). O atraso é a espera pelo bloco mais o
+    bloco que ainda está na saída; não inclui o hardware depois do SDL."""
+    frequency, size, channels = pygame.mixer.get_init()
+    silence = pygame.mixer.Sound(buffer=bytes(abs(size) // 8 * channels * 16))
+    channel = pygame.mixer.Channel(0)
+
+    waits = []
+    ends = []
+    for _ in range(rounds + 1):
+        start = time.perf_counter()
+        channel.play(silence)
+        while channel.get_busy() and time.perf_counter() - start < 0.5:
+            time.sleep(0.0002)
+        ends.append(time.perf_counter())
+        waits.append(ends[-1] - start)
+    # O primeiro não começa alinhado a um bloco: só conta para os intervalos
+    block = statistics.median(b - a for a, b in zip(ends, ends[1:]))
+    return statistics.median(waits[1:]) + block, round(block * frequency)
+
+
+def play(name, sound):
+    # Toca no canal reservado do nome (se houver) ou em qualquer canal livre;
+    # `sound` é None quando não há áudio (ver tones.tone)
+    if sound is None or muted:
+        return
+    if name in RESERVED:
+        pygame.mixer.Channel(RESERVED.index(name)).play(sound)
+    else:
+        sound.play()
+
+
+def stop():
+    if ready:
+        pygame.mixer.stop()
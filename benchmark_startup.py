@@ -0,0 +1,196 @@
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import statistics
+import subprocess
+
+GAMES_DIR = os.path.dirname(os.path.abspath(__file__))
+
+PHASES = [
+    "interpreter_start", "import_pygame", "pygame_init", "game_import",
+    "set_mode", "fonts", "assets", "game_init", "first_frame", "total"
+]
+
+
+class FirstFlip(Exception):
+    pass
+
+
+class PhaseTimer:
+    # Envolve funções do pygame e acumula o tempo gasto nelas
+    def __init__(self):
+        self.totals = {}
+
+    def wrap(self, owner, name, phase):
+        original = getattr(owner, name)
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                self.totals[phase] = self.totals.get(phase, 0.0) + time.perf_counter() - start
+
+        setattr(owner, name, timed)
+
+    def take(self, phase):
+        return self.totals.pop(phase, 0.0)
+
+
+def stop_at_first_flip(pygame):
+    def flip(*args):
+        pygame.display.flip_original(*args)
+        raise FirstFlip()
+
+    pygame.display.flip_original = pygame.display.flip
+    pygame.display.flip = flip
+    pygame.display.update = flip
+
+
+def wrap_startup(pygame, phases):
+    phases.wrap(pygame.display, "set_mode", "set_mode")
+    phases.wrap(pygame.font, "Font", "fonts")
+    phases.wrap(pygame.font, "SysFont", "fonts")
+    phases.wrap(pygame.image, "load", "assets")
+    if pygame.mixer.get_init():
+        phases.wrap(pygame.mixer, "Sound", "assets")
+
+
+def probe(entry, launch_time):
+    # Roda em um interpretador novo: mede da partida até o primeiro flip
+    timings = {"interpreter_start": time.time() - launch_time}
+
+    start = time.perf_counter()
+    import pygame
+    import audio  # antes de pygame.init(), como nos jogos: configura o mixer
+    timings["import_pygame"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    pygame.init()
+    timings["pygame_init"] = time.perf_counter() - start
+
+    import importlib
+    phases = PhaseTimer()
+    wrap_startup(pygame, phases)
+
+    start = time.perf_counter()
+    module = importlib.import_module(os.path.splitext(entry["file"])[0])
+    timings["game_import"] = time.perf_counter() - start - phases.take("fonts") - phases.take("assets")
+
+    start = time.perf_counter()
+    game = getattr(module, entry["class"])()
+    elapsed = time.perf_counter() - start
+    for phase in ("set_mode", "fonts", "assets"):
+        timings[phase] = phases.take(phase)
+    timings["game_init"] = elapsed - timings["set_mode"] - timings["fonts"] - timings["assets"]
+
+    stop_at_first_flip(pygame)
+    start = time.perf_counter()
+    try:
+        game.run()
+    except FirstFlip:
+        pass
+    # Fontes do cache de texto são criadas no primeiro desenho
+    first_frame_fonts = phases.take("fonts")
+    timings["fonts"] += first_frame_fonts
+    timings["first_frame"] = time.perf_counter() - start - first_frame_fonts
+    timings["total"] = time.time() - launch_time
+
+    return timings
+
+
+def probe_in_process(games):
+    # Lançamento pelo seletor, com o processo e a tela já prontos
+    import pygame
+    import game_selector
+
+    selector = game_selector.GameSelector()
+    stop_at_first_flip(pygame)
+    results = {}
+    for entry in games:
+        start = time.perf_counter()
+        game = game_selector.load_game(entry)(selector.screen)
+        try:
+            game.run()
+        except FirstFlip:
+            pass
+        results[entry["file"]] = {"total": time.perf_counter() - start}
+    return results
+
+
+def run_probe(args, env):
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__)] + args,
+        cwd=GAMES_DIR, env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def summarize(runs):
+    return {phase: statistics.median(run[phase] for run in runs) for phase in runs[0]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latência do lançamento até o primeiro frame de cada jogo")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--output", default="startup_benchmark.json")
+    parser.add_argument("--probe", help=argparse.SUPPRESS)
+    parser.add_argument("--probe-in-process", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--launch-time", type=float, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.probe:
+        print(json.dumps(probe(json.loads(args.probe), args.launch_time)))
+        return
+    if args.probe_in_process:
+        from game_selector import GAMES
+        print(json.dumps(probe_in_process(GAMES)))
+        return
+
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy", PYGAME_HIDE_SUPPORT_PROMPT="1")
+    os.environ.update(env)
+    import pygame
+    from game_selector import GAMES as games
+
+    in_process = [run_probe(["--probe-in-process"], env) for _ in range(args.runs)]
+
+    results = []
+    for entry in games:
+        runs = []
+        for _ in range(args.runs):
+            probe_args = ["--probe", json.dumps(entry), "--launch-time", repr(time.time())]
+            runs.append(run_probe(probe_args, env))
+
+        median = summarize(runs)
+        hosted = statistics.median(run[entry["file"]]["total"] for run in in_process)
+        results.append({
+            "name": entry["name"],
+            "file": entry["file"],
+            "class": entry["class"],
+            "runs": runs,
+            "median": median,
+            "in_process_total": hosted
+        })
+        print(f"{entry['file']:<18} cold {median['total'] * 1000:8.1f} ms   in-process {hosted * 1000:8.1f} ms")
+
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "platform": platform.platform(),
+        "runs": args.runs,
+        "phases": PHASES,
+        "results": results
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+import os
+import json
+import time
+import socket
+import statistics
+
+import pygame
+
+import audio
+import tones
+from game_base import Game, main
+from input_capture import event_age
+from text_cache import render_text
+
+CALIBRATION_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "calibration.json")
+# Clique sintetizado, com o ataque na primeira amostra: um arquivo com
+# silêncio no começo somaria esse silêncio ao audio_offset
+CLICK_FREQUENCY = 1000.0
+CLICK_DURATION = 0.03
+CLICK_CHANNEL = "yellow"  # canal reservado de audio.py, o mesmo dos jogos
+
+BEAT = 1.0  # segundos entre batidas
+TAPS = 8  # toques por fase
+
+WHITE = (255, 255, 255)
+YELLOW = (255, 255, 0)
+
+
+def station():
+    return socket.gethostname()
+
+
+def load_offsets():
+    """Atrasos medidos nesta estação, em segundos: audio_offset (do som até o
+    toque) e video_offset (da imagem até o toque). Os dois já incluem o atraso
+    da entrada (teclado ou MakeyMakey)."""
+    offsets = {"audio_offset": 0.0, "video_offset": 0.0}
+    try:
+        with open(CALIBRATION_FILE, encoding="utf-8") as f:
+            offsets.update(json.load(f).get(station(), {}))
+    except (OSError, ValueError):
+        pass
+    return offsets
+
+
+def save_offsets(offsets):
+    try:
+        with open(CALIBRATION_FILE, encoding="utf-8") as f:
+            stations = json.load(f)
+    except (OSError, ValueError):
+        stations = {}
+    stations[station()] = offsets
+    with open(CALIBRATION_FILE, "w", encoding="utf-8") as f:
+        json.dump(stations, f, indent=2)
+
+
+class CalibrationGame(Game):
+    """Mede os atrasos da estação: primeiro o jogador toca junto com um
+    clique (só som), depois junto com um clarão (só imagem). A mediana da
+    diferença entre toque e batida vira o offset salvo para esta estação."""
+
+    caption = "Calibração"
+
+    def init(self):
+        self.phases = ["audio", "video"]
+        self.phase = 0
+        self.taps = []
+        self.results = {}
+        self.beat_times = []
+        self.next_beat = time.perf_counter() + BEAT
+        self.flash_until = 0.0
+        self.flash_pending = False  # clarão pedido, ainda não desenhado
+
+        self.click = tones.tone(CLICK_FREQUENCY, CLICK_DURATION)
+        if self.click is None:
+            # Sem som não dá para medir o áudio: mantém o valor que já existia
+            print("Aviso: sem áudio, a fase de som será pulada.")
+            self.results["audio_offset"] = load_offsets()["audio_offset"]
+            self.phase = 1
+
+    @property
+    def done(self):
+        return self.phase >= len(self.phases)
+
+    def handle_event(self, event):
+        if event.type == pygame.QUIT:
+            return False
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_ESCAPE:
+                return False
+            if not self.done:
+                # Hora de chegada da tecla, não a do frame que a tratou
+                self.tap(time.perf_counter() - event_age(event))
+        return True
+
+    def tap(self, tap_time):
+        # Diferença para a batida mais próxima, já tocada ou a próxima (o
+        # toque pode vir antes dela)
+        beat = min(self.beat_times + [self.next_beat], key=lambda beat: abs(tap_time - beat))
+        self.taps.append(tap_time - beat)
+
+        if len(self.taps) >= TAPS:
+            name = self.phases[self.phase] + "_offset"
+            self.results[name] = statistics.median(self.taps)
+            self.taps = []
+            self.beat_times = []
+            self.phase += 1
+            if self.done:
+                save_offsets(self.results)
+                print(f"Calibration saved for {station()}: "
+                      + ", ".join(f"{k} {v * 1000:.0f} ms" for k, v in self.results.items()))
+
+    def update(self, dt):
+        if self.done:
+            return
+        now = time.perf_counter()
+        if now >= self.next_beat:
+            self.next_beat += BEAT
+            if self.phases[self.phase] == "audio":
+                audio.play(CLICK_CHANNEL, self.click)
+                # A batida vale quando o clique foi entregue ao mixer
+                self.add_beat(time.perf_counter())
+            else:
+                # ...e o clarão, quando o quadro com ele vai para a tela (render)
+                self.flash_until = now + 0.1
+                self.flash_pending = True
+
+    def add_beat(self, beat_time):
+        self.beat_times = (self.beat_times + [beat_time])[-4:]
+
+    def render(self):
+        super().render()
+        if self.flash_pending:
+            # O quadro com o clarão é apresentado logo depois de render()
+            self.flash_pending = False
+            self.add_beat(time.perf_counter())
+
+    def draw(self):
+        center = (self.screen.get_width() // 2, self.screen.get_height() // 2)
+        if self.done:
+            lines = ["Calibração salva!"] + [f"{k}: {v * 1000:.0f} ms" for k, v in self.results.items()]
+            lines.append("ESC para sair")
+        elif self.phases[self.phase] == "audio":
+            lines = ["Aperte qualquer tecla junto com o clique", f"{len(self.taps)} / {TAPS}"]
+        else:
+            lines = ["Aperte qualquer tecla quando o círculo piscar", f"{len(self.taps)} / {TAPS}"]
+            if time.perf_counter() < self.flash_until:
+                self.mark(pygame.draw.circle(self.screen, YELLOW, (center[0], center[1] + 120), 60))
+
+        for i, line in enumerate(lines):
+            text = render_text(line, 36, WHITE)
+            self.mark(self.screen.blit(text, text.get_rect(center=(center[0], center[1] - 80 + i * 40))))
+
+
+if __name__ == "__main__":
+    main(CalibrationGame)
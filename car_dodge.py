@@ -1,6 +1,11 @@
 import pygame
-import sys
 import random
+import sys
+import numpy as np
+
+from game_base import Game, main
+from renderer import display_format, has_display
+from text_cache import render_text
 
 pygame.init()
 
@@ -30,6 +35,59 @@ OBSTACLE_SPEED = 200
 ROAD_WIDTH = int(WINDOW_WIDTH * 0.67)
 ROAD_X = (WINDOW_WIDTH - ROAD_WIDTH) // 2
 
+OBSTACLE_COLORS = [RED, YELLOW, GREEN, GRAY]
+POOL_SIZE = 64  # bem mais que os carros que cabem na tela no jogo normal
+
+# Faixa central: traço de 30 px a cada 40 px
+LINE_LENGTH = 30
+LINE_GAP = 40
+CENTER_X = ROAD_X + ROAD_WIDTH // 2
+
+# Textura da faixa central com um período a mais que a tela, desenhada uma vez;
+# o fundo é transparente (colorkey), então o título continua aparecendo entre os traços
+road_strips = {}
+
+def road_strip(height):
+    key = (height, has_display())
+    strip = road_strips.get(key)
+    if strip is None:
+        strip = display_format(pygame.Surface((5, height + LINE_GAP)))
+        strip.fill(BLACK)
+        for y in range(-LINE_GAP, height + LINE_GAP, LINE_GAP):
+            pygame.draw.line(strip, YELLOW, (2, y + LINE_GAP - LINE_LENGTH), (2, y + LINE_GAP), 3)
+        strip.set_colorkey(BLACK, pygame.RLEACCEL)
+        road_strips.clear()
+        road_strips[key] = strip
+    return strip
+
+# Carros desenhados uma vez por cor e tamanho
+car_sprites = {}
+
+def car_sprite(color, player, width, height):
+    key = (color, player, width, height, has_display())
+    sprite = car_sprites.get(key)
+    if sprite is None:
+        sprite = display_format(pygame.Surface((width, height)))
+
+        # Os detalhes foram desenhados para um carro de 40x60: escala para o tamanho atual
+        def scaled(x, y, w, h):
+            return pygame.Rect(round(x * width / 40), round(y * height / 60),
+                               round(w * width / 40), round(h * height / 60))
+
+        sprite.fill(color)
+        pygame.draw.rect(sprite, WHITE if player else BLACK, sprite.get_rect(), 2)
+
+        # Windows (na frente do carro: em cima para o jogador, embaixo para quem vem)
+        pygame.draw.rect(sprite, WHITE, scaled(5, 5 if player else 40, 30, 15))
+
+        # Wheels
+        wheel_y = 45 if player else 3
+        pygame.draw.rect(sprite, BLACK, scaled(2, wheel_y, 8, 12))
+        pygame.draw.rect(sprite, BLACK, scaled(30, wheel_y, 8, 12))
+
+        car_sprites[key] = sprite
+    return sprite
+
 class Car:
     def __init__(self):
         self.x = WINDOW_WIDTH // 2 - CAR_WIDTH // 2
@@ -39,13 +97,13 @@ class Car:
         
     def update(self, dt, keys):
         # Movement with arrow keys
-        if keys[pygame.K_LEFT] and self.x > ROAD_X:
+        if pygame.K_LEFT in keys and self.x > ROAD_X:
             self.x -= self.speed * dt
-        if keys[pygame.K_RIGHT] and self.x < ROAD_X + ROAD_WIDTH - CAR_WIDTH:
+        if pygame.K_RIGHT in keys and self.x < ROAD_X + ROAD_WIDTH - CAR_WIDTH:
             self.x += self.speed * dt
-        if keys[pygame.K_UP] and self.y < WINDOW_HEIGHT - CAR_HEIGHT:
+        if pygame.K_UP in keys and self.y < WINDOW_HEIGHT - CAR_HEIGHT:
             self.y += self.speed * dt
-        if keys[pygame.K_DOWN] and self.y > 0:
+        if pygame.K_DOWN in keys and self.y > 0:
             self.y -= self.speed * dt
             
         self.rect.x = int(self.x)
@@ -53,82 +111,100 @@ class Car:
     
     def draw(self, screen):
         # Draw car as blue rectangle with details
-        pygame.draw.rect(screen, BLUE, self.rect)
-        pygame.draw.rect(screen, WHITE, self.rect, 2)
-        
-        # Car details
-        # Windows
-        window_rect = pygame.Rect(self.rect.x + 5, self.rect.y + 5, 30, 15)
-        pygame.draw.rect(screen, WHITE, window_rect)
-        
-        # Wheels
-        wheel1 = pygame.Rect(self.rect.x + 2, self.rect.y + 45, 8, 12)
-        wheel2 = pygame.Rect(self.rect.x + 30, self.rect.y + 45, 8, 12)
-        pygame.draw.rect(screen, BLACK, wheel1)
-        pygame.draw.rect(screen, BLACK, wheel2)
+        return screen.blit(car_sprite(BLUE, True, CAR_WIDTH, CAR_HEIGHT), self.rect)
+
+class ObstaclePool:
+    """Obstáculos em arrays de tamanho fixo (posição, cor, ativo), com as
+    posições livres numa pilha: criar e reciclar são O(1)."""
+
+    def __init__(self, capacity=POOL_SIZE):
+        self.capacity = capacity
+        self.x = np.zeros(capacity, dtype=np.int32)
+        self.y = np.zeros(capacity, dtype=np.float64)
+        self.color = np.zeros(capacity, dtype=np.int8)
+        self.active = np.zeros(capacity, dtype=bool)
+        self.free = list(range(capacity - 1, -1, -1))
+
+    def __len__(self):
+        return self.capacity - len(self.free)
+
+    def spawn(self):
+        if not self.free:
+            return
+        i = self.free.pop()
+        self.x[i] = random.randint(ROAD_X, ROAD_X + ROAD_WIDTH - OBSTACLE_WIDTH)
+        self.y[i] = -OBSTACLE_HEIGHT
+        self.color[i] = OBSTACLE_COLORS.index(random.choice(OBSTACLE_COLORS))
+        self.active[i] = True
+
+    def update(self, dt, speed):
+        # Devolve quantos saíram da tela (e voltaram para a pilha de livres)
+        self.y += speed * dt
+        gone = np.flatnonzero(self.active & (self.y > WINDOW_HEIGHT))
+        self.active[gone] = False
+        self.free.extend(gone.tolist())
+        return len(gone)
+
+    def collisions(self, rect):
+        # Fase larga: só quem está na faixa de altura do carro vai para o colliderect
+        top = np.trunc(self.y).astype(np.int32)
+        band = np.flatnonzero(self.active & (top < rect.bottom) & (top + OBSTACLE_HEIGHT > rect.top))
+        hits = 0
+        for i in band.tolist():
+            if rect.colliderect(pygame.Rect(int(self.x[i]), int(top[i]), OBSTACLE_WIDTH, OBSTACLE_HEIGHT)):
+                hits += 1
+        return hits
+
+    def clear(self):
+        self.active[:] = False
+        self.free = list(range(self.capacity - 1, -1, -1))
 
-class Obstacle:
-    def __init__(self):
-        self.x = random.randint(ROAD_X, ROAD_X + ROAD_WIDTH - OBSTACLE_WIDTH)
-        self.y = -OBSTACLE_HEIGHT
-        self.speed = OBSTACLE_SPEED
-        self.rect = pygame.Rect(self.x, self.y, OBSTACLE_WIDTH, OBSTACLE_HEIGHT)
-        self.color = random.choice([RED, YELLOW, GREEN, GRAY])
-        
-    def update(self, dt):
-        self.y += self.speed * dt
-        self.rect.y = int(self.y)
-        
     def draw(self, screen):
-        # Draw obstacle car
-        pygame.draw.rect(screen, self.color, self.rect)
-        pygame.draw.rect(screen, BLACK, self.rect, 2)
-        
-        # Car details
-        # Windows
-        window_rect = pygame.Rect(self.rect.x + 5, self.rect.y + 40, 30, 15)
-        pygame.draw.rect(screen, WHITE, window_rect)
-        
-        # Wheels
-        wheel1 = pygame.Rect(self.rect.x + 2, self.rect.y + 3, 8, 12)
-        wheel2 = pygame.Rect(self.rect.x + 30, self.rect.y + 3, 8, 12)
-        pygame.draw.rect(screen, BLACK, wheel1)
-        pygame.draw.rect(screen, BLACK, wheel2)
-    
-    def is_off_screen(self):
-        return self.y > WINDOW_HEIGHT
+        # Todos os obstáculos num único blits(); devolve os retângulos desenhados
+        sprites = [car_sprite(color, False, OBSTACLE_WIDTH, OBSTACLE_HEIGHT) for color in OBSTACLE_COLORS]
+        index = np.flatnonzero(self.active)
+        return screen.blits([
+            (sprites[color], (x, y))
+            for x, y, color in zip(self.x[index].tolist(), np.trunc(self.y[index]).astype(np.int32).tolist(),
+                                   self.color[index].tolist())
+        ])
 
-class CarDodgeGame:
-    def __init__(self):
-        self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT), pygame.FULLSCREEN)
-        pygame.display.set_caption("Desviar de Carros - Arcade Clássico")
-        self.clock = pygame.time.Clock()
-        
+class CarDodgeGame(Game):
+    caption = "Desviar de Carros - Arcade Clássico"
+    fps = FPS
+    # Modo de estresse: mantém este número de obstáculos na tela, sem fim de jogo
+    stress = 0
+
+    def init(self):
         self.car = Car()
-        self.obstacles = []
+        self.obstacles = ObstaclePool(max(POOL_SIZE, self.stress))
+        self.hits = 0
         self.spawn_timer = 0
         self.spawn_interval = 1.5
         self.score = 0
         self.game_over = False
         self.speed_multiplier = 1.0
         
-        self.font = pygame.font.Font(None, 48)
-        self.small_font = pygame.font.Font(None, 24)
-        
         # Road lines animation
         self.road_line_offset = 0
+
+        # Teclas seguradas, mantidas pelos eventos (sem consultar o teclado)
+        self.keys_held = set()
         
-    def handle_events(self):
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                return False
+    def handle_event(self, event):
+        if event.type == pygame.QUIT:
+            return False
 
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
-                    return False
-                elif self.game_over:
-                    if event.key == pygame.K_SPACE:
-                        self.reset_game()
+        if event.type == pygame.KEYUP:
+            self.keys_held.discard(event.key)
+
+        if event.type == pygame.KEYDOWN:
+            self.keys_held.add(event.key)
+            if event.key == pygame.K_ESCAPE:
+                return False
+            elif self.game_over:
+                if event.key == pygame.K_SPACE:
+                    self.reset_game()
 
         return True
     
@@ -136,64 +212,57 @@ class CarDodgeGame:
         if self.game_over:
             return
             
-        keys = pygame.key.get_pressed()
-        self.car.update(dt, keys)
+        self.car.update(dt, self.keys_held)
         
         # Spawn obstacles
         self.spawn_timer += dt
-        if self.spawn_timer >= self.spawn_interval:
-            self.obstacles.append(Obstacle())
+        if self.stress:
+            # Intervalo para que, na velocidade atual, `stress` carros cruzem a tela juntos
+            interval = (WINDOW_HEIGHT + OBSTACLE_HEIGHT) / (OBSTACLE_SPEED * self.speed_multiplier) / self.stress
+            while self.spawn_timer >= interval:
+                self.obstacles.spawn()
+                self.spawn_timer -= interval
+        elif self.spawn_timer >= self.spawn_interval:
+            self.obstacles.spawn()
             self.spawn_timer = 0
             # Gradually increase difficulty
             if self.spawn_interval > 0.8:
                 self.spawn_interval -= 0.01
             
-        # Update obstacles
-        for obstacle in self.obstacles[:]:
-            obstacle.speed = OBSTACLE_SPEED * self.speed_multiplier
-            obstacle.update(dt)
+        # Update obstacles; off-screen ones are recycled and add score
+        for _ in range(self.obstacles.update(dt, OBSTACLE_SPEED * self.speed_multiplier)):
+            self.score += 10
             
-            # Remove off-screen obstacles and add score
-            if obstacle.is_off_screen():
-                self.obstacles.remove(obstacle)
-                self.score += 10
-                
-                # Increase speed every 100 points
-                if self.score > 0 and self.score % 100 == 0:
-                    self.speed_multiplier += 0.1
+            # Increase speed every 100 points
+            if self.score > 0 and self.score % 100 == 0 and not self.stress:
+                self.speed_multiplier += 0.1
             
-            # Check collision
-            if obstacle.rect.colliderect(self.car.rect):
+        # Check collision
+        hits = self.obstacles.collisions(self.car.rect)
+        if hits:
+            self.hits += hits
+            if not self.stress:
                 self.game_over = True
         
         # Animate road lines
-        self.road_line_offset += 400 * dt * self.speed_multiplier
-        if self.road_line_offset >= 40:
-            self.road_line_offset = 0
+        self.road_line_offset = (self.road_line_offset + 400 * dt * self.speed_multiplier) % LINE_GAP
     
-    def draw_road(self):
+    def draw_road(self, surface):
         # Road background
         road_rect = pygame.Rect(ROAD_X, 0, ROAD_WIDTH, WINDOW_HEIGHT)
-        pygame.draw.rect(self.screen, DARK_GRAY, road_rect)
+        pygame.draw.rect(surface, DARK_GRAY, road_rect)
         
         # Road borders
-        pygame.draw.line(self.screen, WHITE, (ROAD_X, 0), (ROAD_X, WINDOW_HEIGHT), 4)
-        pygame.draw.line(self.screen, WHITE, (ROAD_X + ROAD_WIDTH, 0), (ROAD_X + ROAD_WIDTH, WINDOW_HEIGHT), 4)
-        
-        # Center line (animated)
-        center_x = ROAD_X + ROAD_WIDTH // 2
-        line_length = 30
-        line_gap = 40
-        
-        y = -line_length + self.road_line_offset
-        while y < WINDOW_HEIGHT:
-            if y + line_length > 0:
-                start_y = max(0, y)
-                end_y = min(WINDOW_HEIGHT, y + line_length)
-                pygame.draw.line(self.screen, YELLOW, (center_x, start_y), (center_x, end_y), 3)
-            y += line_gap
+        pygame.draw.line(surface, WHITE, (ROAD_X, 0), (ROAD_X, WINDOW_HEIGHT), 4)
+        pygame.draw.line(surface, WHITE, (ROAD_X + ROAD_WIDTH, 0), (ROAD_X + ROAD_WIDTH, WINDOW_HEIGHT), 4)
+
+    def draw_center_line(self):
+        # Center line (animated): um recorte da textura, deslocado pelo offset
+        offset = LINE_GAP - int(self.road_line_offset) % LINE_GAP
+        area = pygame.Rect(0, offset, 5, WINDOW_HEIGHT)
+        self.mark(self.screen.blit(road_strip(WINDOW_HEIGHT), (CENTER_X - 2, 0), area))
     
-    def draw_controls(self):
+    def draw_controls(self, surface):
         # Control scheme (standardized): ↑ Amarelo, ← Vermelho, ↓ Azul, → Verde
         controls = [
             ("← Vermelho - Esquerda", RED, 20, 20),
@@ -203,28 +272,33 @@ class CarDodgeGame:
         ]
         
         for text, color, x, y in controls:
-            control_text = pygame.font.Font(None, 20).render(text, True, color)
-            self.screen.blit(control_text, (x, y))
+            control_text = render_text(text, 20, color)
+            surface.blit(control_text, (x, y))
+
+    def draw_static(self, surface):
+        surface.fill(GREEN)  # Grass on sides
+        self.draw_road(surface)
+        self.draw_controls(surface)
+
+        # Title
+        title = render_text("Desvie dos Carros!", 24, WHITE)
+        title_rect = title.get_rect(center=(WINDOW_WIDTH // 2, 30))
+        surface.blit(title, title_rect)
     
     def draw_ui(self):
         # Score
-        score_text = self.font.render(f"Pontos: {self.score}", True, WHITE)
-        self.screen.blit(score_text, (20, WINDOW_HEIGHT - 60))
+        score_text = render_text(f"Pontos: {self.score}", 48, WHITE)
+        self.mark(self.screen.blit(score_text, (20, WINDOW_HEIGHT - 60)))
         
         # Speed indicator
-        speed_text = self.small_font.render(f"Velocidade: {self.speed_multiplier:.1f}x", True, WHITE)
-        self.screen.blit(speed_text, (20, WINDOW_HEIGHT - 30))
-        
-        # Title
-        title = self.small_font.render("Desvie dos Carros!", True, WHITE)
-        title_rect = title.get_rect(center=(WINDOW_WIDTH // 2, 30))
-        self.screen.blit(title, title_rect)
+        speed_text = render_text(f"Velocidade: {self.speed_multiplier:.1f}x", 24, WHITE)
+        self.mark(self.screen.blit(speed_text, (20, WINDOW_HEIGHT - 30)))
         
         if self.game_over:
             # Game over screen
-            game_over_text = self.font.render("FIM DE JOGO", True, RED)
-            restart_text = self.small_font.render("Pressione ESPAÇO para reiniciar", True, WHITE)
-            final_score = self.small_font.render(f"Pontuação Final: {self.score}", True, WHITE)
+            game_over_text = render_text("FIM DE JOGO", 48, RED)
+            restart_text = render_text("Pressione ESPAÇO para reiniciar", 24, WHITE)
+            final_score = render_text(f"Pontuação Final: {self.score}", 24, WHITE)
             
             game_over_rect = game_over_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2 - 40))
             restart_rect = restart_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2))
@@ -234,49 +308,36 @@ class CarDodgeGame:
             overlay = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
             overlay.set_alpha(128)
             overlay.fill(BLACK)
-            self.screen.blit(overlay, (0, 0))
+            self.mark(self.screen.blit(overlay, (0, 0)))
             
             self.screen.blit(game_over_text, game_over_rect)
             self.screen.blit(restart_text, restart_rect)
             self.screen.blit(final_score, score_rect)
     
     def draw(self):
-        self.screen.fill(GREEN)  # Grass on sides
-        self.draw_road()
+        self.draw_center_line()
         
         # Draw obstacles
-        for obstacle in self.obstacles:
-            obstacle.draw(self.screen)
+        for rect in self.obstacles.draw(self.screen):
+            self.mark(rect)
         
         # Draw player car
-        self.car.draw(self.screen)
+        self.mark(self.car.draw(self.screen))
         
-        self.draw_controls()
         self.draw_ui()
-        
-        pygame.display.flip()
-    
+
     def reset_game(self):
         self.car = Car()
-        self.obstacles = []
+        self.obstacles.clear()
         self.spawn_timer = 0
         self.spawn_interval = 1.5
         self.score = 0
         self.game_over = False
         self.speed_multiplier = 1.0
         self.road_line_offset = 0
-    
-    def run(self):
-        running = True
-        while running:
-            dt = self.clock.tick(FPS) / 1000.0
-            running = self.handle_events()
-            self.update(dt)
-            self.draw()
-        
-        pygame.quit()
-        sys.exit()
 
 if __name__ == "__main__":
-    game = CarDodgeGame()
-    game.run()
+    if "--stress" in sys.argv:
+        index = sys.argv.index("--stress") + 1
+        CarDodgeGame.stress = int(sys.argv[index]) if index < len(sys.argv) else 2000
+    main(CarDodgeGame)
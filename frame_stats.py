@@ -0,0 +1,151 @@
+import os
+import json
+import time
+from collections import deque
+
+import pygame
+
+from text_cache import render_text
+
+PHASES = ("events", "update", "draw", "flip")
+WINDOW = 600  # frames na janela móvel (~10 s a 60 fps)
+PERCENTILES = (50, 95, 99)
+OVERLAY_KEY = pygame.K_F3
+OVERLAY_REFRESH = 30  # frames entre atualizações do texto do overlay
+
+
+def output_from_argv(argv):
+    # --frame-stats arquivo.csv | arquivo.jsonl
+    if "--frame-stats" in argv:
+        index = argv.index("--frame-stats") + 1
+        if index < len(argv):
+            return argv[index]
+    return None
+
+
+def percentile(ordered, p):
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+
+class FrameStats:
+    """Mede cada fase do frame (eventos, update, draw, flip) em ms.
+
+    Guarda uma janela móvel para p50/p95/p99/máx, desenha um overlay
+    (liga/desliga com F3) e, se houver arquivo de saída, grava uma linha
+    por frame em CSV ou JSONL (pela extensão). O arquivo é aberto para
+    acrescentar, então seletor e jogos podem usar o mesmo.
+
+    Também guarda, por tecla ou clique, quanto o evento esperou entre o carimbo da
+    captura e o tratamento (linha "input"): é o erro que o jogo teria ao
+    julgar o toque pela hora do frame.
+    """
+
+    def __init__(self, name, output=None):
+        self.name = name
+        self.output = output
+        self.file = None
+        self.jsonl = bool(output) and output.endswith(".jsonl")
+        self.windows = {phase: deque(maxlen=WINDOW) for phase in PHASES + ("total",)}
+        self.inputs = deque(maxlen=WINDOW)
+        self.frame = 0
+        self.current = {}
+        self.start = self.last = 0.0
+        self.visible = False
+        self.lines = []
+
+        if output:
+            new_file = not os.path.exists(output) or os.path.getsize(output) == 0
+            # Uma linha por escrita: seletor e jogo (no mesmo processo ou
+            # não) abrem o mesmo arquivo e não podem ficar com linhas no buffer
+            self.file = open(output, "a", newline="", buffering=1)
+            if new_file and not self.jsonl:
+                self.file.write(",".join(("name", "frame") + PHASES + ("total",)) + "\n")
+
+    def begin(self):
+        self.current = {}
+        self.start = self.last = time.perf_counter()
+
+    def lap(self, phase):
+        now = time.perf_counter()
+        self.current[phase] = self.current.get(phase, 0.0) + (now - self.last) * 1000
+        self.last = now
+
+    def discard(self):
+        # Frame que não representa o loop (ex.: o seletor esperando um jogo)
+        self.current = {}
+        self.start = self.last = time.perf_counter()
+
+    def end(self):
+        if not self.current:
+            return
+        row = {phase: self.current.get(phase, 0.0) for phase in PHASES}
+        row["total"] = (self.last - self.start) * 1000
+        for phase, value in row.items():
+            self.windows[phase].append(value)
+        self.frame += 1
+
+        if self.file:
+            if self.jsonl:
+                self.file.write(json.dumps(dict(name=self.name, frame=self.frame,
+                                                **{k: round(v, 3) for k, v in row.items()})) + "\n")
+            else:
+                values = [f"{row[phase]:.3f}" for phase in PHASES + ("total",)]
+                self.file.write(",".join([self.name, str(self.frame)] + values) + "\n")
+
+    def flush(self):
+        if self.file:
+            self.file.flush()
+
+    def input(self, latency):
+        # Atraso (ms) de uma tecla ou clique entre a chegada e o tratamento
+        self.inputs.append(latency)
+
+    def handle_event(self, event):
+        # True se o evento era o atalho do overlay (o jogo não o recebe)
+        if event.type == pygame.KEYDOWN and event.key == OVERLAY_KEY:
+            self.visible = not self.visible
+            self.lines = []
+            return True
+        return False
+
+    def summary(self):
+        result = {}
+        windows = dict(self.windows)
+        if self.inputs:
+            windows["input"] = self.inputs
+        for phase, window in windows.items():
+            ordered = sorted(window)
+            result[phase] = {f"p{p}": percentile(ordered, p) for p in PERCENTILES}
+            result[phase]["max"] = ordered[-1] if ordered else 0.0
+        return result
+
+    def draw(self, surface):
+        if not self.visible:
+            return None
+        if not self.lines or self.frame % OVERLAY_REFRESH == 0:
+            self.lines = ["ms        p50    p95    p99    max"]
+            for phase, values in self.summary().items():
+                self.lines.append(f"{phase:<7}" + "".join(f"{values[key]:7.2f}" for key in ("p50", "p95", "p99", "max")))
+
+        surfaces = [render_text(line, 20, (255, 255, 255)) for line in self.lines]
+        width = max(text.get_width() for text in surfaces) + 16
+        height = len(surfaces) * 18 + 12
+        rect = pygame.Rect(surface.get_width() - width - 10, 10, width, height)
+        surface.fill((0, 0, 0), rect)
+        for i, text in enumerate(surfaces):
+            surface.blit(text, (rect.x + 8, rect.y + 6 + i * 18))
+        return rect
+
+    def close(self):
+        if self.file:
+            self.file.close()
+            self.file = None
+            values = self.summary()["total"]
+            print(f"{self.name}: {self.frame} frames, total p50 {values['p50']:.2f} ms, "
+                  f"p95 {values['p95']:.2f} ms, p99 {values['p99']:.2f} ms, max {values['max']:.2f} ms")
+            if self.inputs:
+                values = self.summary()["input"]
+                print(f"{self.name}: {len(self.inputs)} key presses, input latency "
+                      f"p50 {values['p50']:.2f} ms, p95 {values['p95']:.2f} ms, max {values['max']:.2f} ms")
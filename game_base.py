@@ -0,0 +1,141 @@
+import pygame
+import sys
+
+import audio  # antes de pygame.init(): configura o buffer do mixer
+from renderer import Renderer
+from frame_stats import FrameStats, output_from_argv
+from input_capture import InputCapture, event_age
+
+pygame.init()
+
+FPS = 60
+
+
+class Game:
+    """Interface comum dos jogos: init, handle_event, update, draw e teardown.
+
+    Um jogo pode rodar sozinho (abre a própria tela cheia) ou dentro do
+    seletor, recebendo a superfície de tela que já existe. step() e render()
+    permitem simular sem tela e sem relógio real: com uma superfície fora da
+    tela e random.seed() fixo, a simulação é determinística.
+
+    O que não muda entre frames é desenhado uma vez em draw_static(); draw()
+    desenha só o conteúdo dinâmico e passa cada região por mark(), usada
+    pelo modo de retângulos sujos (dirty_rects=True).
+
+    run() mede cada fase do frame em frame_stats (overlay com F3; com
+    frame_stats_output, grava também um arquivo por frame). Os eventos
+    chegam carimbados pela captura (event.stamp, ver input_capture); jogos
+    que julgam tempo usam event_age(event) em vez da hora do frame.
+    """
+
+    caption = ""
+    fps = FPS
+
+    def __init__(self, screen=None, dirty_rects=False, frame_stats_output=None):
+        if screen is None:
+            info = pygame.display.Info()
+            screen = pygame.display.set_mode((info.current_w, info.current_h), pygame.FULLSCREEN)
+        pygame.display.set_caption(self.caption)
+        self.screen = screen
+        self.capture = InputCapture()
+        self.renderer = Renderer(screen, self.draw_static, dirty_rects)
+        self.frame_stats = FrameStats(type(self).__name__, frame_stats_output)
+        self.init()
+
+    @classmethod
+    def headless(cls):
+        # Sem tela também não há som: os jogos seguem chamando audio.play()
+        audio.muted = True
+        info = pygame.display.Info()
+        return cls(pygame.Surface((info.current_w, info.current_h)))
+
+    def init(self):
+        pass
+
+    def handle_event(self, event):
+        if event.type == pygame.QUIT:
+            return False
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+            return False
+        return True
+
+    def handle_events(self):
+        return self.handle_inputs(self.capture.drain())
+
+    def handle_inputs(self, inputs):
+        running = True
+        for event in inputs:
+            if event.type in (pygame.VIDEORESIZE, pygame.WINDOWSIZECHANGED):
+                # Mudou o modo de vídeo: as camadas estáticas são refeitas
+                self.renderer.invalidate()
+            if self.frame_stats.handle_event(event):
+                continue
+            if event.type in (pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN) and hasattr(event, "stamp"):
+                # Quanto o evento esperou na fila até ser tratado
+                self.frame_stats.input(event_age(event) * 1000)
+            if not self.handle_event(event):
+                running = False
+        return running
+
+    def update(self, dt):
+        pass
+
+    def draw_static(self, surface):
+        surface.fill((0, 0, 0))
+
+    def draw(self):
+        pass
+
+    def mark(self, rect):
+        return self.renderer.mark(rect)
+
+    def teardown(self):
+        pass
+
+    def step(self, inputs, dt):
+        # Avança o estado sem tocar na tela; inputs são eventos do pygame
+        running = self.handle_inputs(inputs)
+        self.update(dt)
+        return running
+
+    def render(self):
+        self.renderer.begin()
+        self.draw()
+        self.mark(self.frame_stats.draw(self.screen))
+
+    def run(self):
+        running = True
+        dt = 0.0
+        stats = self.frame_stats
+        try:
+            while running:
+                stats.begin()
+                running = self.handle_events()
+                stats.lap("events")
+                self.update(dt)
+                stats.lap("update")
+                self.render()
+                stats.lap("draw")
+                self.capture.poll()
+                self.renderer.present()
+                stats.lap("flip")
+                stats.end()
+                # Espera depois do flip (o primeiro frame não espera um período
+                # inteiro), lendo a fila de eventos enquanto isso
+                dt = self.capture.wait(self.fps)
+        finally:
+            # Também se o jogo falhar: o seletor segue rodando no mesmo processo
+            self.teardown()
+            # Não deixar sons tocando quando voltar ao seletor
+            audio.stop()
+            stats.close()
+
+
+def main(game_class):
+    game = game_class(dirty_rects="--dirty-rects" in sys.argv,
+                      frame_stats_output=output_from_argv(sys.argv))
+    game.run()
+
+    pygame.quit()
+    sys.exit()
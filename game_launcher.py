@@ -0,0 +1,135 @@
+import os
+import sys
+import json
+import time
+import queue
+import runpy
+import threading
+import subprocess
+
+GAMES_DIR = os.path.dirname(os.path.abspath(__file__))
+READY = "zygote-ready"
+
+
+def zygote_main():
+    # Processo "quente": pygame já importado e inicializado, esperando um jogo
+    import pygame
+    import audio  # antes de pygame.init(): configura o buffer do mixer
+    pygame.init()
+    audio.init()
+
+    print(READY, flush=True)
+    line = sys.stdin.readline()
+    if not line:
+        return
+
+    # A partir daqui a saída do jogo vai para stderr, o pipe era só para o aviso
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    sys.argv = json.loads(line)
+    runpy.run_path(os.path.join(GAMES_DIR, sys.argv[0]), run_name="__main__")
+
+
+class ZygotePool:
+    """Mantém processos com pygame pronto para isolar cada jogo sem pagar
+    a partida a frio do interpretador a cada lançamento."""
+
+    def __init__(self, size=1):
+        self.size = size
+        self.ready = queue.Queue()
+        self.launches = 0
+        self.saved_total = 0.0
+        # Zygotes ainda aquecendo, para close() não deixar nenhum órfão
+        self.lock = threading.Lock()
+        self.spawning = set()
+        self.closed = False
+
+        for _ in range(size):
+            self.refill()
+
+    def spawn(self):
+        env = dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT="1")
+        start = time.perf_counter()
+        with self.lock:
+            if self.closed:
+                return
+            try:
+                proc = subprocess.Popen(
+                    [sys.executable, os.path.abspath(__file__), "--zygote"],
+                    cwd=GAMES_DIR, env=env, text=True,
+                    stdin=subprocess.PIPE, stdout=subprocess.PIPE
+                )
+            except Exception as e:
+                print(f"Error starting zygote: {e}")
+                self.ready.put((None, 0.0))
+                return
+            self.spawning.add(proc)
+
+        ready = False
+        for line in proc.stdout:
+            if line.strip() == READY:
+                ready = True
+                break
+
+        with self.lock:
+            self.spawning.discard(proc)
+            closed = self.closed
+            if ready and not closed:
+                # Dentro do lock: close() não pode esvaziar a fila antes deste put
+                self.ready.put((proc, time.perf_counter() - start))
+                return
+        if closed:
+            # O pool fechou enquanto este aquecia
+            if proc.poll() is None:
+                proc.terminate()
+            proc.wait()
+            return
+
+        proc.wait()
+        print("Error starting zygote: process exited before it was ready")
+        self.ready.put((None, 0.0))
+
+    def refill(self):
+        threading.Thread(target=self.spawn, daemon=True).start()
+
+    def launch(self, game_file, args=()):
+        # Se o zygote ainda está aquecendo, esperar continua mais barato que partir a frio
+        wait_start = time.perf_counter()
+        proc, warmup = self.ready.get()
+        waited = time.perf_counter() - wait_start
+        self.refill()
+
+        if proc is None:
+            subprocess.run([sys.executable, game_file] + list(args), cwd=GAMES_DIR)
+            return 0.0
+
+        proc.stdin.write(json.dumps([game_file] + list(args)) + "\n")
+        proc.stdin.close()
+        proc.wait()
+
+        saved = max(0.0, warmup - waited)
+        self.launches += 1
+        self.saved_total += saved
+        print(f"Launched {game_file} from zygote: saved {saved * 1000:.0f} ms "
+              f"({self.saved_total * 1000:.0f} ms over {self.launches} launches)")
+        return saved
+
+    def close(self):
+        with self.lock:
+            self.closed = True
+            spawning = list(self.spawning)
+        for proc in spawning:
+            proc.terminate()
+
+        while True:
+            try:
+                proc, _ = self.ready.get_nowait()
+            except queue.Empty:
+                break
+            if proc is not None:
+                proc.stdin.close()
+                proc.wait()
+
+
+if __name__ == "__main__":
+    if "--zygote" in sys.argv:
+        zygote_main()
@@ -1,11 +1,19 @@
 import pygame
 import sys
-import subprocess
+import os
+import importlib
+
+import audio  # antes de pygame.init(): configura o buffer do mixer
+from game_launcher import ZygotePool
+from text_cache import render_text
+from frame_stats import FrameStats, output_from_argv
 
 pygame.init()
 
-WINDOW_WIDTH = 1000
-WINDOW_HEIGHT = 720
+# Tela cheia, a mesma superfície é usada pelos jogos
+info = pygame.display.Info()
+WINDOW_WIDTH = info.current_w
+WINDOW_HEIGHT = info.current_h
 FPS = 60
 
 WHITE = (255, 255, 255)
@@ -15,24 +23,44 @@ LIGHT_GRAY = (200, 200, 200)
 BLUE = (100, 150, 255)
 GREEN = (100, 255, 100)
 
+CAPTION = "Protótipo seletor PEC1"
+
+# Registro dos jogos: nome no menu, arquivo e classe (ver game_base.Game)
+GAMES = [
+    {"name": "Jogo TESTE", "file": "magic_buttons.py", "class": "MagicButtons"},
+    {"name": "Jogo Da Cobrinha", "file": "snake_game.py", "class": "SnakeGame"},
+    {"name": "Jogo Dos Blocos", "file": "tetris_game.py", "class": "TetrisGame"},
+    {"name": "Jogo Dos Carros", "file": "car_dodge.py", "class": "CarDodgeGame"},
+    {"name": "Jogo Da Musica", "file": "guitar_hero.py", "class": "GuitarHero"},
+    {"name": "Jogo De Memoria", "file": "genius_game.py", "class": "GeniusGame"},
+    {"name": "Quiz Privacidade", "file": "quiz_game.py", "class": "QuizGame"}
+]
+
+# Demonstração mostrada quando o quiosque fica parado (--attract)
+ATTRACT = {"name": "Demonstração", "file": "tetris_bot.py", "class": "TetrisAttract", "args": ["--attract"]}
+ATTRACT_IDLE = 60  # segundos sem entrada
+
+def load_game(entry):
+    module = importlib.import_module(os.path.splitext(entry["file"])[0])
+    return getattr(module, entry["class"])
+
 class GameSelector:
-    def __init__(self):
-        self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
-        pygame.display.set_caption("Protótipo seletor PEC1")
+    def __init__(self, isolated=False, dirty_rects=False, frame_stats_output=None, attract=False):
+        self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT), pygame.FULLSCREEN)
+        pygame.display.set_caption(CAPTION)
         self.clock = pygame.time.Clock()
+        # Abre e mede o áudio aqui, não no primeiro som do primeiro jogo
+        audio.init()
         
-        self.font_title = pygame.font.Font(None, 72)
-        self.font_button = pygame.font.Font(None, 36)
-        
-        self.games = [
-            {"name": "Jogo TESTE", "file": "magic_buttons.py"},
-            {"name": "Jogo Da Cobrinha", "file": "snake_game.py"},
-            {"name": "Jogo Dos Blocos", "file": "tetris_game.py"},
-            {"name": "Jogo Dos Carros", "file": "car_dodge.py"},
-            {"name": "Jogo Da Musica", "file": "guitar_hero.py"},
-            {"name": "Jogo De Memoria", "file": "genius_game.py"},
-            {"name": "Quiz Privacidade", "file": "quiz_game.py"}
-        ]
+        self.games = GAMES
+
+        # Modo isolado: cada jogo roda em um processo próprio, já aquecido
+        self.launcher = ZygotePool() if isolated else None
+        self.dirty_rects = dirty_rects
+        self.frame_stats = FrameStats("GameSelector", frame_stats_output)
+        self.frame_stats_output = frame_stats_output
+        self.attract = attract
+        self.idle_since = pygame.time.get_ticks()
         
         self.button_height = 45
         self.button_width = 400
@@ -45,6 +73,12 @@ class GameSelector:
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 return False
+
+            if event.type in (pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN, pygame.MOUSEMOTION):
+                self.idle_since = pygame.time.get_ticks()
+
+            if self.frame_stats.handle_event(event):
+                continue
                 
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_UP:
@@ -70,17 +104,38 @@ class GameSelector:
         return True
     
     def launch_game(self, index):
-        game_file = self.games[index]["file"]
+        self.launch(self.games[index])
+
+    def launch(self, entry):
+        # O jogo acrescenta no mesmo arquivo: o que é do seletor vai antes
+        self.frame_stats.flush()
         try:
-            subprocess.run([sys.executable, game_file], cwd=".")
+            if self.launcher:
+                args = list(entry.get("args", []))
+                if self.dirty_rects:
+                    args.append("--dirty-rects")
+                if self.frame_stats_output:
+                    args += ["--frame-stats", self.frame_stats_output]
+                self.launcher.launch(entry["file"], args)
+            else:
+                # O jogo roda neste processo, na tela do seletor
+                game = load_game(entry)(self.screen, dirty_rects=self.dirty_rects,
+                                        frame_stats_output=self.frame_stats_output)
+                game.run()
         except Exception as e:
-            print(f"Error launching {game_file}: {e}")
+            print(f"Error launching {entry['file']}: {e}")
+
+        pygame.display.set_caption(CAPTION)
+        pygame.event.clear()
+        # O tempo dentro do jogo não conta como frame do seletor
+        self.frame_stats.discard()
+        self.idle_since = pygame.time.get_ticks()
     
     def draw(self):
         self.screen.fill(WHITE)
         
         # Title
-        title_text = self.font_title.render("Selecione seu jogo", True, BLACK)
+        title_text = render_text("Selecione seu jogo", 72, BLACK)
         title_rect = title_text.get_rect(center=(WINDOW_WIDTH // 2, 80))
         self.screen.blit(title_text, title_rect)
         
@@ -107,22 +162,36 @@ class GameSelector:
             pygame.draw.rect(self.screen, BLACK, button_rect, 3)
             
             # Draw text
-            text = self.font_button.render(game["name"], True, text_color)
+            text = render_text(game["name"], 36, text_color)
             text_rect = text.get_rect(center=button_rect.center)
             self.screen.blit(text, text_rect)
-        
-        pygame.display.flip()
+
+        self.frame_stats.draw(self.screen)
     
     def run(self):
         running = True
+        stats = self.frame_stats
         while running:
+            stats.begin()
             running = self.handle_events()
+            stats.lap("events")
             self.draw()
+            stats.lap("draw")
+            pygame.display.flip()
+            stats.lap("flip")
+            stats.end()
             self.clock.tick(FPS)
+
+            if self.attract and pygame.time.get_ticks() - self.idle_since > ATTRACT_IDLE * 1000:
+                self.launch(ATTRACT)
         
+        if self.launcher:
+            self.launcher.close()
+        stats.close()
         pygame.quit()
         sys.exit()
 
 if __name__ == "__main__":
-    selector = GameSelector()
+    selector = GameSelector(isolated="--isolated" in sys.argv, dirty_rects="--dirty-rects" in sys.argv,
+                            frame_stats_output=output_from_argv(sys.argv), attract="--attract" in sys.argv)
     selector.run()
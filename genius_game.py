@@ -1,16 +1,17 @@
 import pygame
 import random
 import time
-import sys
 import math
-import os
+import numpy as np
+
+import audio
+import tones
+from game_base import Game, main
+from input_capture import event_age
+from renderer import display_format
+from text_cache import render_text
 
 pygame.init()
-# Inicializa o mixer de áudio (se disponível)
-try:
-    pygame.mixer.init()
-except Exception:
-    print("Aviso: pygame.mixer não pôde ser inicializado. Áudio pode não funcionar.")
 
 FPS = 60
 
@@ -34,12 +35,11 @@ CIRCLE_CENTER = (WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2)
 CIRCLE_RADIUS = min(WINDOW_WIDTH, WINDOW_HEIGHT) // 4  # Ajusta ao tamanho da tela
 INNER_RADIUS = CIRCLE_RADIUS // 6
 
-class GeniusGame:
-    def __init__(self):
-        self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT), pygame.FULLSCREEN)
-        pygame.display.set_caption("Jogo de Memória Genius")
-        self.clock = pygame.time.Clock()
-        
+class GeniusGame(Game):
+    caption = "Jogo de Memória Genius"
+    fps = FPS
+
+    def init(self):
         self.sequence = []
         self.player_sequence = []
         self.current_level = 1
@@ -50,6 +50,10 @@ class GeniusGame:
         self.last_flash_time = 0
         self.flash_duration = 500  # Duração consistente do flash em ms
         self.completion_time = 0  # Tempo quando sequência foi completada
+        self.now = 0  # Relógio do jogo em ms, avançado por update()
+        # Toques recebidos no frame, tratados em update() depois que o relógio
+        # avança: a idade do evento só faz sentido contra o relógio atualizado
+        self.presses = []
         
         self.sectors = {
             'yellow': {'start_angle': 45, 'end_angle': 135},     # Cima (↑)
@@ -64,43 +68,25 @@ class GeniusGame:
             'blue': (BLUE, DARK_BLUE),
             'yellow': (YELLOW, DARK_YELLOW)
         }
-        
-        self.font = pygame.font.Font(None, 48)
-        self.small_font = pygame.font.Font(None, 36)
-
-        # Carregar sons para cada cor. Coloque arquivos em ./assets/red.wav, etc.
-        # Se os arquivos não existirem, o jogo continuará sem áudio e mostrará um aviso.
-        assets_dir = os.path.join(os.path.dirname(__file__), "assets")
-        self.sounds = {}
-        sound_files = {
-            'red': os.path.join(assets_dir, 'red.wav'),
-            'green': os.path.join(assets_dir, 'green.wav'),
-            'blue': os.path.join(assets_dir, 'blue.wav'),
-            'yellow': os.path.join(assets_dir, 'yellow.wav'),
-            # Som tocado quando o jogador erra
-            'game_over': os.path.join(assets_dir, 'game_over.wav')
-        }
 
-        for color, path in sound_files.items():
-            try:
-                if os.path.isfile(path):
-                    self.sounds[color] = pygame.mixer.Sound(path)
-                else:
-                    self.sounds[color] = None
-                    print(f"Aviso: arquivo de som não encontrado para '{color}': {path}")
-            except Exception as e:
-                self.sounds[color] = None
-                print(f"Erro ao carregar som para {color}: {e}")
+        # A geometria só depende do centro e do raio: o tabuleiro é desenhado
+        # uma vez em cada estado (nenhum ou um setor aceso) e o clique é
+        # resolvido por um mapa de pixels
+        self.board_rect = pygame.Rect(0, 0, 2 * CIRCLE_RADIUS + 6, 2 * CIRCLE_RADIUS + 6)
+        self.board_rect.center = CIRCLE_CENTER
+        self.sector_names = list(self.sectors.keys())
+        self.boards = {lit: self.build_board(lit) for lit in [None] + self.sector_names}
+        self.sector_map = self.build_sector_map()
+
+        # Tons das cores e do fim de jogo, sintetizados já na partida (ver
+        # tones.py); cada um toca no seu canal (ver audio.py)
+        for name in audio.RESERVED:
+            tones.note(name, self.flash_duration / 1000)
 
     def play_sound(self, color):
         """Toca o som associado à cor, se disponível."""
-        try:
-            sound = self.sounds.get(color)
-            if sound:
-                sound.play()
-        except Exception:
-            # Não falhar o jogo se o áudio der problema
-            pass
+        # O tom dura o mesmo que o flash
+        audio.play(color, tones.note(color, self.flash_duration / 1000))
         
     def generate_sequence(self):
         self.sequence.append(random.choice(['red', 'green', 'blue', 'yellow']))
@@ -112,14 +98,19 @@ class GeniusGame:
         self.generate_sequence()
         self.show_sequence()
         
+    def set_state(self, state):
+        # Os textos do estado e do nível ficam na camada estática
+        self.game_state = state
+        self.renderer.invalidate()
+
     def show_sequence(self):
-        self.game_state = "mostrando"
+        self.set_state("mostrando")
         self.sequence_index = 0
         self.active_button = None
-        self.last_flash_time = pygame.time.get_ticks()
+        self.last_flash_time = self.now
         
     def update_sequence_display(self):
-        current_time = pygame.time.get_ticks()
+        current_time = self.now
         
         if self.sequence_index < len(self.sequence):
             if current_time - self.last_flash_time > 500:
@@ -134,56 +125,39 @@ class GeniusGame:
                     self.last_flash_time = current_time
         else:
             if current_time - self.last_flash_time > 500:
-                self.game_state = "entrada"
+                self.set_state("entrada")
                 self.player_sequence = []
                 
     def get_clicked_sector(self, pos):
-        x, y = pos
-        cx, cy = CIRCLE_CENTER
-
-        distance = math.sqrt((x - cx) ** 2 + (y - cy) ** 2)
-        if distance < INNER_RADIUS or distance > CIRCLE_RADIUS:
+        # Consulta o mapa de setores pré-calculado (ver build_sector_map)
+        x = pos[0] - self.board_rect.x
+        y = pos[1] - self.board_rect.y
+        if not (0 <= x < self.board_rect.width and 0 <= y < self.board_rect.height):
             return None
+        index = self.sector_map[x, y]
+        return self.sector_names[index - 1] if index else None
 
-        angle = math.degrees(math.atan2(y - cy, x - cx))
-        if angle < 0:
-            angle += 360
-
-        for sector_name, sector_data in self.sectors.items():
-            start = sector_data['start_angle']
-            end = sector_data['end_angle']
-
-            if start > end:
-                # Ângulo passa pelo 0 (ex: 270 a 90)
-                if angle >= start or angle < end:
-                    return sector_name
-            else:
-                if start <= angle < end:
-                    return sector_name
-        return None
-    
-    def handle_keyboard_input(self, color):
+    def handle_keyboard_input(self, color, age=0.0):
         if self.game_state != "entrada":
             return
-            
+
+        # Hora do toque no relógio do jogo: a da chegada do evento, não a do frame
+        press_time = self.now - age * 1000
         self.player_sequence.append(color)
         self.active_button = color
-        self.button_flash_time = pygame.time.get_ticks()
+        self.button_flash_time = press_time
         # Toca o som correspondente a cor quando jogador pressiona
         self.play_sound(color)
         
         if self.player_sequence[-1] != self.sequence[len(self.player_sequence) - 1]:
-            self.game_state = "fim_jogo"
+            self.set_state("fim_jogo")
             # Tocar som de game over
-            try:
-                self.play_sound('game_over')
-            except Exception:
-                pass
+            self.play_sound('game_over')
         elif len(self.player_sequence) == len(self.sequence):
-            self.game_state = "completo"
-            self.completion_time = pygame.time.get_ticks()
+            self.set_state("completo")
+            self.completion_time = press_time
                 
-    def draw_sector(self, sector_name, is_active):
+    def draw_sector(self, surface, sector_name, is_active):
         start_deg = self.sectors[sector_name]['start_angle']
         end_deg = self.sectors[sector_name]['end_angle']
 
@@ -207,8 +181,8 @@ class GeniusGame:
 
         points.append(CIRCLE_CENTER)
 
-        pygame.draw.polygon(self.screen, color, points)
-        pygame.draw.polygon(self.screen, WHITE, points, 3)
+        pygame.draw.polygon(surface, color, points)
+        pygame.draw.polygon(surface, WHITE, points, 3)
 
         inner_points = [CIRCLE_CENTER]
 
@@ -225,117 +199,142 @@ class GeniusGame:
 
         inner_points.append(CIRCLE_CENTER)
 
-        pygame.draw.polygon(self.screen, BLACK, inner_points)
+        pygame.draw.polygon(surface, BLACK, inner_points)
 
-    def draw(self):
-        self.screen.fill(BLACK)
-        
-        current_time = pygame.time.get_ticks()
-        
+    def build_board(self, lit):
+        # Tabuleiro completo com o setor `lit` aceso (None = todos apagados).
+        # Desenha nas coordenadas da tela e recorta: os polígonos têm vértices
+        # fracionários e deslocá-los mudaria o arredondamento das bordas
+        canvas = pygame.Surface(self.screen.get_size())
         for sector_name in self.sectors.keys():
-            is_active = (self.active_button == sector_name and 
-                        current_time - self.button_flash_time < self.flash_duration)
-            self.draw_sector(sector_name, is_active)
-            
-        pygame.draw.circle(self.screen, BLACK, CIRCLE_CENTER, INNER_RADIUS)
-        pygame.draw.circle(self.screen, WHITE, CIRCLE_CENTER, INNER_RADIUS, 3)
-        
-        if self.game_state == "entrada" and current_time - self.button_flash_time > self.flash_duration:
-            self.active_button = None
-            
+            self.draw_sector(canvas, sector_name, sector_name == lit)
+
+        pygame.draw.circle(canvas, BLACK, CIRCLE_CENTER, INNER_RADIUS)
+        pygame.draw.circle(canvas, WHITE, CIRCLE_CENTER, INNER_RADIUS, 3)
+        return display_format(canvas.subsurface(self.board_rect.clip(canvas.get_rect())).copy())
+
+    def build_sector_map(self):
+        # Para cada pixel do tabuleiro, 1 + índice do setor (0 = fora do anel)
+        xs, ys = np.meshgrid(np.arange(self.board_rect.width) + self.board_rect.x - CIRCLE_CENTER[0],
+                             np.arange(self.board_rect.height) + self.board_rect.y - CIRCLE_CENTER[1],
+                             indexing="ij")
+        distance = np.sqrt(xs ** 2 + ys ** 2)
+        angle = np.degrees(np.arctan2(ys, xs))
+        angle[angle < 0] += 360
+
+        sector_map = np.zeros(xs.shape, dtype=np.uint8)
+        ring = (distance >= INNER_RADIUS) & (distance <= CIRCLE_RADIUS)
+        for index, sector_name in enumerate(self.sector_names, 1):
+            start = self.sectors[sector_name]['start_angle']
+            end = self.sectors[sector_name]['end_angle']
+            if start > end:
+                # Ângulo passa pelo 0 (ex: 270 a 90)
+                inside = (angle >= start) | (angle < end)
+            else:
+                inside = (start <= angle) & (angle < end)
+            sector_map[ring & inside & (sector_map == 0)] = index
+        return sector_map
+
+    def draw_static(self, surface):
+        # Tabuleiro apagado e textos mudam só com o estado (ver set_state);
+        # draw() só cobre o tabuleiro com o setor aceso
+        surface.fill(BLACK)
+        surface.blit(self.boards[None], self.board_rect)
+
         if self.game_state != "esperando":
-            level_text = self.font.render(f"Nivel: {self.current_level}", True, WHITE)
-            self.screen.blit(level_text, (WINDOW_WIDTH // 2 - level_text.get_width() // 2, WINDOW_HEIGHT - 150))
+            level_text = render_text(f"Nivel: {self.current_level}", 48, WHITE)
+            surface.blit(level_text, (WINDOW_WIDTH // 2 - level_text.get_width() // 2, WINDOW_HEIGHT - 150))
         
        
         if self.game_state == "esperando" and len(self.sequence) == 0 and self.current_level == 1:
             text_start_y = CIRCLE_CENTER[1] + CIRCLE_RADIUS + 80
 
-            start_text = self.font.render("Pressione ESPACO para iniciar", True, WHITE)
-            self.screen.blit(start_text, (WINDOW_WIDTH // 2 - start_text.get_width() // 2, text_start_y))
+            start_text = render_text("Pressione ESPACO para iniciar", 48, WHITE)
+            surface.blit(start_text, (WINDOW_WIDTH // 2 - start_text.get_width() // 2, text_start_y))
 
-            controls_title = self.font.render("Controles:", True, WHITE)
-            self.screen.blit(controls_title, (WINDOW_WIDTH // 2 - controls_title.get_width() // 2, text_start_y + 80))
+            controls_title = render_text("Controles:", 48, WHITE)
+            surface.blit(controls_title, (WINDOW_WIDTH // 2 - controls_title.get_width() // 2, text_start_y + 80))
 
         
             left_margin = 50
             right_margin = WINDOW_WIDTH - 250
 
-            control_up = self.small_font.render("CIMA = Amarelo", True, YELLOW)
-            self.screen.blit(control_up, (left_margin, text_start_y + 130))
+            control_up = render_text("CIMA = Amarelo", 36, YELLOW)
+            surface.blit(control_up, (left_margin, text_start_y + 130))
 
-            control_left = self.small_font.render("ESQUERDA = Vermelho", True, RED)
-            self.screen.blit(control_left, (left_margin, text_start_y + 170))
+            control_left = render_text("ESQUERDA = Vermelho", 36, RED)
+            surface.blit(control_left, (left_margin, text_start_y + 170))
 
-            control_down = self.small_font.render("BAIXO = Azul", True, BLUE)
-            self.screen.blit(control_down, (right_margin, text_start_y + 130))
+            control_down = render_text("BAIXO = Azul", 36, BLUE)
+            surface.blit(control_down, (right_margin, text_start_y + 130))
 
-            control_right = self.small_font.render("DIREITA = Verde", True, GREEN)
-            self.screen.blit(control_right, (right_margin, text_start_y + 170))
+            control_right = render_text("DIREITA = Verde", 36, GREEN)
+            surface.blit(control_right, (right_margin, text_start_y + 170))
 
-            exit_text = self.small_font.render("Pressione ESC para sair", True, WHITE)
-            self.screen.blit(exit_text, (WINDOW_WIDTH // 2 - exit_text.get_width() // 2, text_start_y + 230))
+            exit_text = render_text("Pressione ESC para sair", 36, WHITE)
+            surface.blit(exit_text, (WINDOW_WIDTH // 2 - exit_text.get_width() // 2, text_start_y + 230))
         elif self.game_state == "mostrando":
-            watch_text = self.font.render("Observe a sequencia...", True, WHITE)
-            self.screen.blit(watch_text, (WINDOW_WIDTH // 2 - watch_text.get_width() // 2, WINDOW_HEIGHT - 100))
+            watch_text = render_text("Observe a sequencia...", 48, WHITE)
+            surface.blit(watch_text, (WINDOW_WIDTH // 2 - watch_text.get_width() // 2, WINDOW_HEIGHT - 100))
         elif self.game_state == "entrada":
-            input_text = self.font.render("Use as setas para repetir a sequencia", True, WHITE)
-            self.screen.blit(input_text, (WINDOW_WIDTH // 2 - input_text.get_width() // 2, WINDOW_HEIGHT - 100))
+            input_text = render_text("Use as setas para repetir a sequencia", 48, WHITE)
+            surface.blit(input_text, (WINDOW_WIDTH // 2 - input_text.get_width() // 2, WINDOW_HEIGHT - 100))
         elif self.game_state == "completo":
-            success_text = self.font.render("Correto! Avancando para o proximo nivel...", True, WHITE)
-            self.screen.blit(success_text, (WINDOW_WIDTH // 2 - success_text.get_width() // 2, WINDOW_HEIGHT - 100))
+            success_text = render_text("Correto! Avancando para o proximo nivel...", 48, WHITE)
+            surface.blit(success_text, (WINDOW_WIDTH // 2 - success_text.get_width() // 2, WINDOW_HEIGHT - 100))
         elif self.game_state == "fim_jogo":
             
-            game_over_text = self.font.render("Fim de Jogo!", True, WHITE)
-            self.screen.blit(game_over_text, (WINDOW_WIDTH // 2 - game_over_text.get_width() // 2, WINDOW_HEIGHT - 180))
-            restart_text = self.font.render("Pressione ESPACO para reiniciar", True, WHITE)
-            self.screen.blit(restart_text, (WINDOW_WIDTH // 2 - restart_text.get_width() // 2, WINDOW_HEIGHT - 120))
-            
-        pygame.display.flip()
-        
-    def run(self):
-        running = True
-        
-        while running:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_ESCAPE:
-                        running = False
-                    elif event.key == pygame.K_SPACE:
-                        if self.game_state in ["esperando", "fim_jogo"]:
-                            self.start_new_game()
-                    elif event.key == pygame.K_UP:
-                        self.handle_keyboard_input('yellow')
-                    elif event.key == pygame.K_LEFT:
-                        self.handle_keyboard_input('red')
-                    elif event.key == pygame.K_DOWN:
-                        self.handle_keyboard_input('blue')
-                    elif event.key == pygame.K_RIGHT:
-                        self.handle_keyboard_input('green')
-                elif event.type == pygame.MOUSEBUTTONDOWN:
-                    # Permitir clicar nos setores com o mouse (toca som também)
-                    pos = pygame.mouse.get_pos()
-                    sector = self.get_clicked_sector(pos)
-                    if sector and self.game_state == "entrada":
-                        self.handle_keyboard_input(sector)
-                        
-            if self.game_state == "mostrando":
-                self.update_sequence_display()
-            elif self.game_state == "completo":
-                current_time = pygame.time.get_ticks()
-                if current_time - self.completion_time > self.flash_duration + 500:
-                    self.current_level += 1
-                    self.generate_sequence()
-                    self.show_sequence()
-                
-            self.draw()
-            self.clock.tick(FPS)
-            
-        pygame.quit()
-        sys.exit()
+            game_over_text = render_text("Fim de Jogo!", 48, WHITE)
+            surface.blit(game_over_text, (WINDOW_WIDTH // 2 - game_over_text.get_width() // 2, WINDOW_HEIGHT - 180))
+            restart_text = render_text("Pressione ESPACO para reiniciar", 48, WHITE)
+            surface.blit(restart_text, (WINDOW_WIDTH // 2 - restart_text.get_width() // 2, WINDOW_HEIGHT - 120))
+
+    def draw(self):
+        if self.active_button is not None and self.now - self.button_flash_time < self.flash_duration:
+            self.mark(self.screen.blit(self.boards[self.active_button], self.board_rect))
+
+    def handle_event(self, event):
+        if event.type == pygame.QUIT:
+            return False
+        elif event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_ESCAPE:
+                return False
+            elif event.key == pygame.K_SPACE:
+                if self.game_state in ["esperando", "fim_jogo"]:
+                    self.start_new_game()
+            elif event.key == pygame.K_UP:
+                self.presses.append(('yellow', event))
+            elif event.key == pygame.K_LEFT:
+                self.presses.append(('red', event))
+            elif event.key == pygame.K_DOWN:
+                self.presses.append(('blue', event))
+            elif event.key == pygame.K_RIGHT:
+                self.presses.append(('green', event))
+        elif event.type == pygame.MOUSEBUTTONDOWN:
+            # Permitir clicar nos setores com o mouse (toca som também)
+            sector = self.get_clicked_sector(event.pos)
+            if sector and self.game_state == "entrada":
+                self.presses.append((sector, event))
+
+        return True
+
+    def update(self, dt):
+        self.now += dt * 1000
+
+        for color, event in self.presses:
+            self.handle_keyboard_input(color, event_age(event))
+        self.presses = []
+
+        if self.game_state == "mostrando":
+            self.update_sequence_display()
+        elif self.game_state == "entrada":
+            if self.now - self.button_flash_time > self.flash_duration:
+                self.active_button = None
+        elif self.game_state == "completo":
+            if self.now - self.completion_time > self.flash_duration + 500:
+                self.current_level += 1
+                self.generate_sequence()
+                self.show_sequence()
 
 if __name__ == "__main__":
-    game = GeniusGame()
-    game.run()
\ No newline at end of file
+    main(GeniusGame)
@@ -1,6 +1,15 @@
 import pygame
 import sys
-import random
+from collections import deque
+
+import audio
+import tones
+from game_base import Game, main
+from input_capture import event_age
+from text_cache import render_text
+from note_chart import Chart, load_chart, random_notes
+from song_clock import SongClock
+from calibration import CalibrationGame, load_offsets
 
 pygame.init()
 
@@ -26,6 +35,15 @@ NOTE_WIDTH = int(WINDOW_WIDTH * 0.08)
 NOTE_HEIGHT = int(WINDOW_HEIGHT * 0.05)
 NOTE_SPEED = 300
 HIT_ZONE_TOLERANCE = 30
+NOTE_COLORS = [YELLOW, GREEN, BLUE, RED]
+
+# Em segundos de música: a nota deve ser tocada quando sua base chega em BUTTON_Y
+HIT_WINDOW = HIT_ZONE_TOLERANCE / NOTE_SPEED
+LEAD_TIME = BUTTON_Y / NOTE_SPEED  # do topo da tela até os botões
+MISS_DELAY = (WINDOW_HEIGHT + NOTE_HEIGHT - BUTTON_Y) / NOTE_SPEED  # dos botões até sair da tela
+LANE_SOUNDS = ["yellow", "red", "blue", "green"]  # som de acerto de cada botão, na ordem de init()
+HIT_SOUND_DURATION = 0.15  # segundos
+RECENT_HITS = 20  # acertos na média do desvio mostrada no placar
 
 class GuitarButton:
     def __init__(self, x, y, color, key):
@@ -42,36 +60,14 @@ class GuitarButton:
             pygame.draw.rect(screen, self.color, self.rect)
         
         pygame.draw.rect(screen, BLACK, self.rect, 3)
+        return self.rect
 
-class Note:
-    def __init__(self, lane, color):
-        self.lane = lane
-        self.color = color
-        self.rect = pygame.Rect(0, -NOTE_HEIGHT, NOTE_WIDTH, NOTE_HEIGHT)
-        self.hit = False
-        self.missed = False
-        
-    def update(self, dt, button_x):
-        self.rect.x = button_x + (BUTTON_WIDTH - NOTE_WIDTH) // 2
-        self.rect.y += NOTE_SPEED * dt
-        
-        if self.rect.y > WINDOW_HEIGHT and not self.hit:
-            self.missed = True
-    
-    def draw(self, screen):
-        if not self.hit:
-            pygame.draw.rect(screen, self.color, self.rect)
-            pygame.draw.rect(screen, WHITE, self.rect, 2)
-    
-    def is_in_hit_zone(self, button_y):
-        return abs(self.rect.bottom - button_y) <= HIT_ZONE_TOLERANCE
-
-class GuitarHero:
-    def __init__(self):
-        self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT), pygame.FULLSCREEN)
-        pygame.display.set_caption("Herói da Guitarra - Protótipo")
-        self.clock = pygame.time.Clock()
-        
+class GuitarHero(Game):
+    caption = "Herói da Guitarra - Protótipo"
+    fps = FPS
+    chart_path = None  # música em JSON (ver note_chart); sem ela, notas aleatórias
+
+    def init(self):
         button_spacing = (WINDOW_WIDTH - (4 * BUTTON_WIDTH)) // 5
         start_x = button_spacing
         
@@ -82,84 +78,122 @@ class GuitarHero:
             GuitarButton(start_x + 3 * (BUTTON_WIDTH + button_spacing), BUTTON_Y, GREEN, pygame.K_RIGHT)
         ]
         
-        self.font = pygame.font.Font(None, 36)
-        
-        self.notes = []
-        self.note_spawn_timer = 0
-        self.note_spawn_interval = 1.0
+        if self.chart_path:
+            self.chart = load_chart(self.chart_path)
+            self.note_source = None
+        else:
+            self.chart = Chart()
+            # Primeira nota entra pelo topo da tela, como no gerador antigo
+            self.note_source = random_notes(start=LEAD_TIME + 1.0)
+        self.song_time = 0.0
+
+        # Na tela de verdade o tempo vem do áudio (ou do relógio); sem tela,
+        # avança pelo dt de step() e a simulação continua determinística
+        self.song_clock = None
+        if self.screen is pygame.display.get_surface():
+            self.song_clock = SongClock(self.chart.audio)
+
+        # Atrasos desta estação (ver calibration.py)
+        offsets = load_offsets()
+        self.audio_offset = offsets["audio_offset"]
+        self.video_offset = offsets["video_offset"]
         self.score = 0
         self.hits = 0
         self.misses = 0
+        self.hit_errors = deque(maxlen=RECENT_HITS)  # toque menos nota, em segundos
+        self.hit_sounds = [tones.note(name, HIT_SOUND_DURATION) for name in LANE_SOUNDS]
         
-    def handle_events(self):
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                return False
+    def handle_event(self, event):
+        if event.type == pygame.QUIT:
+            return False
 
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
-                    return False
-                for i, button in enumerate(self.buttons):
-                    if event.key == button.key:
-                        button.pressed = True
-                        self.check_hit(i)
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_ESCAPE:
+                return False
+            for i, button in enumerate(self.buttons):
+                if event.key == button.key:
+                    button.pressed = True
+                    self.check_hit(i, event_age(event))
 
-            if event.type == pygame.KEYUP:
-                for button in self.buttons:
-                    if event.key == button.key:
-                        button.pressed = False
+        if event.type == pygame.KEYUP:
+            for button in self.buttons:
+                if event.key == button.key:
+                    button.pressed = False
 
         return True
     
-    def spawn_note(self):
-        lane = random.randint(0, 3)
-        color = [YELLOW, GREEN, BLUE, RED][lane]
-        note = Note(lane, color)
-        self.notes.append(note)
-    
-    def check_hit(self, lane):
-        for note in self.notes:
-            if note.lane == lane and not note.hit and not note.missed:
-                if note.is_in_hit_zone(BUTTON_Y):
-                    note.hit = True
-                    self.score += 100
-                    self.hits += 1
-                    return True
-        return False
-    
-    def update_notes(self, dt):
-        for note in self.notes[:]:
-            if not note.hit:
-                button_x = self.buttons[note.lane].rect.x
-                note.update(dt, button_x)
-                
-                if note.missed:
-                    self.misses += 1
-                    self.notes.remove(note)
-            else:
-                self.notes.remove(note)
+    def current_time(self):
+        if self.song_clock is not None and self.song_clock.started:
+            return self.song_clock.now()
+        return self.song_time
+
+    def check_hit(self, lane, age=0.0):
+        # O toque vale na hora em que a tecla chegou (age segundos atrás), não
+        # na hora do frame; o jogador toca junto com o que ouve, então
+        # desconta também o atraso de áudio
+        judged_time = self.current_time() - age - self.audio_offset
+        index = self.chart.find_hit(lane, judged_time, HIT_WINDOW)
+        if index is None:
+            return False
+        self.hit_errors.append(judged_time - self.chart.times[lane][index])
+        audio.play(LANE_SOUNDS[lane], self.hit_sounds[lane])
+        self.score += 100
+        self.hits += 1
+        return True
     
     def update(self, dt):
-        self.note_spawn_timer += dt
-        if self.note_spawn_timer >= self.note_spawn_interval:
-            self.spawn_note()
-            self.note_spawn_timer = 0
-            self.note_spawn_interval = random.uniform(0.8, 2.0)
+        if self.song_clock is None:
+            self.song_time += dt
+        else:
+            if not self.song_clock.started:
+                self.song_clock.play()
+            self.song_time = self.song_clock.now()
+
+        # Música aleatória: gera notas só até o que já cabe na tela
+        if self.note_source is not None:
+            ahead = self.song_time + LEAD_TIME + abs(self.video_offset - self.audio_offset)
+            while self.chart.end_time <= ahead:
+                self.chart.add(*next(self.note_source))
         
-        self.update_notes(dt)
+        self.misses += self.chart.expire(self.song_time - self.audio_offset - MISS_DELAY)
+
+    def teardown(self):
+        if self.song_clock is not None:
+            self.song_clock.stop()
+
+    def draw_notes(self):
+        # Posição é função do tempo da música: base da nota em BUTTON_Y no tempo
+        # dela, adiantada para quem joga olhando chegar junto de quem joga ouvindo
+        song_time = self.song_time - self.audio_offset + self.video_offset
+        for lane, button in enumerate(self.buttons):
+            x = button.rect.x + (BUTTON_WIDTH - NOTE_WIDTH) // 2
+            times = self.chart.times[lane]
+            durations = self.chart.durations[lane]
+            hit = self.chart.hit[lane]
+            for i in self.chart.visible(lane, song_time - MISS_DELAY, song_time + LEAD_TIME):
+                bottom = BUTTON_Y - int((times[i] - song_time) * NOTE_SPEED)
+                rect = pygame.Rect(x, bottom - NOTE_HEIGHT, NOTE_WIDTH, NOTE_HEIGHT)
+                if durations[i]:
+                    # Nota longa: rastro acima da cabeça; depois do acerto, só
+                    # o que ainda não passou da linha dos botões
+                    top = rect.top - int(durations[i] * NOTE_SPEED)
+                    tail_bottom = min(rect.top, BUTTON_Y - NOTE_HEIGHT) if hit[i] else rect.top
+                    if tail_bottom > top:
+                        tail = pygame.Rect(0, top, NOTE_WIDTH // 4, tail_bottom - top)
+                        tail.centerx = rect.centerx
+                        self.mark(pygame.draw.rect(self.screen, NOTE_COLORS[lane], tail))
+                if hit[i]:
+                    continue
+                pygame.draw.rect(self.screen, NOTE_COLORS[lane], rect)
+                pygame.draw.rect(self.screen, WHITE, rect, 2)
+                self.mark(rect)
     
-    def draw(self):
-        self.screen.fill(BLACK)
+    def draw_static(self, surface):
+        surface.fill(BLACK)
         
-        title = self.font.render("Herói da Guitarra - Protótipo", True, WHITE)
+        title = render_text("Herói da Guitarra - Protótipo", 36, WHITE)
         title_rect = title.get_rect(center=(WINDOW_WIDTH // 2, 30))
-        self.screen.blit(title, title_rect)
-
-        score_text = pygame.font.Font(None, 24).render(f"Pontuação: {self.score}", True, WHITE)
-        self.screen.blit(score_text, (20, 20))
-
-        stats_text = pygame.font.Font(None, 24).render(f"Acertos: {self.hits} | Erros: {self.misses}", True, WHITE)
-        self.screen.blit(stats_text, (20, 50))
+        surface.blit(title, title_rect)
 
         instructions = [
             "↑ Amarelo  ← Vermelho  ↓ Azul  → Verde",
@@ -167,29 +201,29 @@ class GuitarHero:
         ]
         
         for i, instruction in enumerate(instructions):
-            text = pygame.font.Font(None, 20).render(instruction, True, WHITE)
+            text = render_text(instruction, 20, WHITE)
             text_rect = text.get_rect(center=(WINDOW_WIDTH // 2, 80 + i * 25))
-            self.screen.blit(text, text_rect)
+            surface.blit(text, text_rect)
+
+    def draw(self):
+        score_text = render_text(f"Pontuação: {self.score}", 24, WHITE)
+        self.mark(self.screen.blit(score_text, (20, 20)))
+
+        stats = f"Acertos: {self.hits} | Erros: {self.misses}"
+        if self.hit_errors:
+            # Desvio médio dos últimos acertos: negativo = adiantado
+            stats += f" | Desvio: {sum(self.hit_errors) / len(self.hit_errors) * 1000:+.0f} ms"
+        stats_text = render_text(stats, 24, WHITE)
+        self.mark(self.screen.blit(stats_text, (20, 50)))
         
-        for note in self.notes:
-            note.draw(self.screen)
+        self.draw_notes()
         
         for button in self.buttons:
-            button.draw(self.screen)
-            
-        pygame.display.flip()
-    
-    def run(self):
-        running = True
-        while running:
-            dt = self.clock.tick(FPS) / 1000.0
-            running = self.handle_events()
-            self.update(dt)
-            self.draw()
-        
-        pygame.quit()
-        sys.exit()
+            self.mark(button.draw(self.screen))
 
 if __name__ == "__main__":
-    game = GuitarHero()
-    game.run()
+    if "--calibrate" in sys.argv:
+        main(CalibrationGame)
+    if "--chart" in sys.argv:
+        GuitarHero.chart_path = sys.argv[sys.argv.index("--chart") + 1]
+    main(GuitarHero)
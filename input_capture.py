@@ -0,0 +1,57 @@
+import time
+
+import pygame
+
+POLL_INTERVAL = 0.001  # segundos entre leituras da fila enquanto o frame espera
+
+
+def event_age(event):
+    # Segundos desde que o evento chegou; 0 para eventos sem carimbo (ex.: step())
+    stamp = getattr(event, "stamp", None)
+    if stamp is None:
+        return 0.0
+    return max(0.0, time.perf_counter() - stamp)
+
+
+class InputCapture:
+    """Lê a fila de eventos do SDL assim que possível e carimba cada evento
+    com a hora de chegada (event.stamp, em time.perf_counter()).
+
+    O pygame 2 não expõe o timestamp do SDL e a fila só pode ser bombeada na
+    thread da janela, então em vez de uma thread de leitura a captura lê a
+    fila entre as fases do frame e, principalmente, durante a espera até o
+    próximo frame, em passos de POLL_INTERVAL. O erro do carimbo cai de até
+    um frame inteiro para cerca de 1 ms.
+    """
+
+    def __init__(self):
+        self.pending = []
+        self.last_frame = time.perf_counter()
+
+    def poll(self):
+        events = pygame.event.get()
+        if events:
+            now = time.perf_counter()
+            for event in events:
+                event.stamp = now
+            self.pending.extend(events)
+
+    def drain(self):
+        # Eventos desde a última chamada, na ordem de chegada
+        self.poll()
+        events, self.pending = self.pending, []
+        return events
+
+    def wait(self, fps):
+        # Faz o papel de clock.tick(fps): espera o resto do frame lendo a
+        # fila e devolve o dt do frame em segundos
+        deadline = self.last_frame + 1.0 / fps
+        while True:
+            self.poll()
+            now = time.perf_counter()
+            if now >= deadline:
+                break
+            time.sleep(min(POLL_INTERVAL, deadline - now))
+        dt = now - self.last_frame
+        self.last_frame = now
+        return dt
@@ -1,7 +1,13 @@
 import pygame
-import sys
 import random
 import math
+import numpy as np
+
+import audio
+import tones
+from game_base import Game, main
+from renderer import display_format, has_display
+from text_cache import render_text
 
 pygame.init()
 
@@ -23,120 +29,209 @@ LIGHT_BLUE = (173, 216, 230)
 
 BUTTON_SIZE = 60
 BUTTON_SPACING = 30
+BUTTON_SOUNDS = ["yellow", "green", "blue", "red"]  # som de cada botão, na ordem de init()
+BUTTON_SOUND_DURATION = 0.3  # segundos
+
+# Fundo em degradê, guardado por resolução
+gradient_cache = {}
+
+def gradient_background(size):
+    key = (size, has_display())
+    background = gradient_cache.get(key)
+    if background is None:
+        # Uma coluna de 1 pixel com o degradê, esticada para a tela inteira
+        width, height = size
+        strip = pygame.Surface((1, height))
+        for y in range(height):
+            color_ratio = y / height
+            r = int(20 + (40 - 20) * color_ratio)
+            g = int(20 + (60 - 20) * color_ratio)
+            b = int(60 + (100 - 60) * color_ratio)
+            strip.set_at((0, y), (r, g, b))
+        background = display_format(pygame.transform.scale(strip, size))
+
+        gradient_cache.clear()
+        gradient_cache[key] = background
+    return background
+
+# Partículas guardadas em arrays (uma posição por partícula), atualizadas
+# todas de uma vez com NumPy
+FIREWORK, STAR, FLOWER, HEART = range(4)
+EFFECTS = {"firework": FIREWORK, "star": STAR, "flower": FLOWER, "heart": HEART}
+PALETTE = [YELLOW, GREEN, BLUE, RED, PURPLE, ORANGE]
+
+# Por efeito: ângulo de saída, velocidade, tamanho e gravidade
+EFFECT_PARAMS = {
+    FIREWORK: {"angle": (-math.pi/3, -2*math.pi/3), "speed": (200, 400), "size": (8, 20), "gravity": 200},
+    STAR: {"angle": (-math.pi/4, -3*math.pi/4), "speed": (150, 350), "size": (15, 30), "gravity": 150},
+    FLOWER: {"angle": (-math.pi/6, -5*math.pi/6), "speed": (120, 280), "size": (20, 35), "gravity": 100},
+    HEART: {"angle": (-math.pi/5, -4*math.pi/5), "speed": (180, 320), "size": (18, 35), "gravity": 180}
+}
+GRAVITY = np.array([EFFECT_PARAMS[effect]["gravity"] for effect in range(4)], dtype=np.float32)
+
+MAX_PARTICLES = 2048
+
+class ParticleSystem:
+    def __init__(self, capacity=MAX_PARTICLES):
+        self.capacity = capacity
+        self.x = np.zeros(capacity, dtype=np.float32)
+        self.y = np.zeros(capacity, dtype=np.float32)
+        self.vx = np.zeros(capacity, dtype=np.float32)
+        self.vy = np.zeros(capacity, dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.float32)
+        self.max_life = np.ones(capacity, dtype=np.float32)
+        self.size = np.zeros(capacity, dtype=np.float32)
+        self.angle = np.zeros(capacity, dtype=np.float32)  # rotação da estrela, giro da flor
+        self.spin = np.zeros(capacity, dtype=np.float32)
+        self.effect = np.zeros(capacity, dtype=np.int8)
+        self.color = np.zeros(capacity, dtype=np.int8)
+        self.alive = np.zeros(capacity, dtype=bool)
+        # Semente tirada do random global, para a simulação continuar determinística
+        self.rng = np.random.default_rng(random.getrandbits(32))
+
+    def allocate(self, count):
+        slots = np.flatnonzero(~self.alive)[:count]
+        if len(slots) < count:
+            # Sem espaço livre: recicla as partículas que estão mais perto de sumir
+            oldest = np.argsort(np.where(self.alive, self.life, np.inf))
+            slots = np.concatenate([slots, oldest[:count - len(slots)]])
+        return slots
+
+    def emit(self, effect_type, color, count, x, y, spread=0, life=1.0, still=False):
+        effect = EFFECTS[effect_type]
+        params = EFFECT_PARAMS[effect]
+        slots = self.allocate(min(count, self.capacity))
+        count = len(slots)
+        rng = self.rng
+
+        self.x[slots] = x + rng.integers(-spread, spread + 1, count) if spread else x
+        self.y[slots] = y + rng.integers(-spread, spread + 1, count) if spread else y
+        if still:
+            self.vx[slots] = 0
+            self.vy[slots] = 0
+        else:
+            # Os intervalos de ângulo vão "para trás" (-π/3 a -2π/3), como no random.uniform
+            low, high = params["angle"]
+            angle = low + (high - low) * rng.random(count)
+            low, high = params["speed"]
+            speed = low + (high - low) * rng.random(count)
+            self.vx[slots] = np.cos(angle) * speed
+            self.vy[slots] = np.sin(angle) * speed
+        low, high = params["size"]
+        self.size[slots] = rng.integers(low, high + 1, count)
+        self.life[slots] = life
+        self.max_life[slots] = life
+        self.effect[slots] = effect
+        self.color[slots] = PALETTE.index(color)
+
+        if effect == STAR:
+            self.angle[slots] = 0
+            self.spin[slots] = rng.uniform(-5, 5, count)
+        elif effect == FLOWER:
+            self.angle[slots] = rng.uniform(0, 2 * math.pi, count)
+            self.spin[slots] = 3
+        else:
+            self.angle[slots] = 0
+            self.spin[slots] = 0
+        self.alive[slots] = True
 
-class Particle:
-    def __init__(self, x, y, color, effect_type):
-        self.x = x
-        self.y = y
-        self.color = color
-        self.effect_type = effect_type
-        self.life = 1.0
-        self.max_life = 1.0
-        
-        if effect_type == "firework":
-            angle = random.uniform(-math.pi/3, -2*math.pi/3)  # Upward angles only
-            speed = random.uniform(200, 400)
-            self.vx = math.cos(angle) * speed
-            self.vy = math.sin(angle) * speed
-            self.size = random.randint(8, 20)
-            
-        elif effect_type == "star":
-            angle = random.uniform(-math.pi/4, -3*math.pi/4)  # Upward angles
-            speed = random.uniform(150, 350)
-            self.vx = math.cos(angle) * speed
-            self.vy = math.sin(angle) * speed
-            self.size = random.randint(15, 30)
-            self.rotation = 0
-            self.rotation_speed = random.uniform(-5, 5)
-            
-        elif effect_type == "flower":
-            angle = random.uniform(-math.pi/6, -5*math.pi/6)  # Wide upward spread
-            speed = random.uniform(120, 280)
-            self.vx = math.cos(angle) * speed
-            self.vy = math.sin(angle) * speed
-            self.size = random.randint(20, 35)
-            self.angle = random.uniform(0, 2 * math.pi)
-            
-        elif effect_type == "heart":
-            angle = random.uniform(-math.pi/5, -4*math.pi/5)  # Upward heart burst
-            speed = random.uniform(180, 320)
-            self.vx = math.cos(angle) * speed
-            self.vy = math.sin(angle) * speed
-            self.size = random.randint(18, 35)
-            self.bounce = 0
-    
     def update(self, dt):
         self.x += self.vx * dt
         self.y += self.vy * dt
         self.life -= dt
-        
-        if self.effect_type == "firework":
-            self.vy += 200 * dt  # gravity
-        elif self.effect_type == "star":
-            self.vy += 150 * dt  # gravity
-            self.rotation += self.rotation_speed * dt
-        elif self.effect_type == "flower":
-            self.vy += 100 * dt  # gravity
-            self.angle += dt * 3
-        elif self.effect_type == "heart":
-            self.vy += 180 * dt  # gravity
-            self.bounce += dt * 10
-    
+        self.vy += GRAVITY[self.effect] * dt
+        self.angle += self.spin * dt
+        self.alive &= self.life > 0
+
+    def clear(self):
+        self.alive[:] = False
+
+    def __len__(self):
+        return int(np.count_nonzero(self.alive))
+
     def draw(self, screen):
-        if self.life <= 0:
-            return
-            
-        alpha = self.life / self.max_life
-        size = int(self.size * alpha)
-        
-        if size < 1:
-            return
-            
-        if self.effect_type == "firework":
-            pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), size)
-            
-        elif self.effect_type == "star":
-            self.draw_star(screen, int(self.x), int(self.y), size)
-            
-        elif self.effect_type == "flower":
-            self.draw_flower(screen, int(self.x), int(self.y), size)
-            
-        elif self.effect_type == "heart":
-            self.draw_heart(screen, int(self.x), int(self.y), size)
-    
-    def draw_star(self, screen, x, y, size):
-        points = []
-        for i in range(10):
-            angle = (i * math.pi / 5) + self.rotation
-            if i % 2 == 0:
-                radius = size
-            else:
-                radius = size // 2
-            px = x + math.cos(angle) * radius
-            py = y + math.sin(angle) * radius
-            points.append((px, py))
-        
-        if len(points) > 2:
-            pygame.draw.polygon(screen, self.color, points)
-    
-    def draw_flower(self, screen, x, y, size):
-        for i in range(6):
-            angle = (i * math.pi / 3) + self.angle
-            px = x + math.cos(angle) * size
-            py = y + math.sin(angle) * size
-            pygame.draw.circle(screen, self.color, (int(px), int(py)), size // 3)
-        pygame.draw.circle(screen, WHITE, (x, y), size // 4)
-    
-    def draw_heart(self, screen, x, y, size):
-        heart_points = [
-            (x, y + size // 2),
-            (x - size // 2, y),
-            (x - size // 4, y - size // 3),
-            (x, y - size // 6),
-            (x + size // 4, y - size // 3),
-            (x + size // 2, y)
+        index = np.flatnonzero(self.alive)
+        sizes = (self.size[index] * (self.life[index] / self.max_life[index])).astype(np.int32)
+        visible = sizes >= 1
+        index = index[visible]
+        sizes = sizes[visible]
+        effects = self.effect[index]
+
+        # Rotação arredondada para um dos passos do atlas, dentro da simetria da forma
+        period = SYMMETRY[effects]
+        steps = np.rint(np.mod(self.angle[index], period) / period * ROTATION_STEPS).astype(np.int32) % ROTATION_STEPS
+        reach = sizes + sizes // 3 + 1
+
+        blit_list = [
+            (particle_sprite(effect, color, size, step), (x - r, y - r))
+            for x, y, r, size, effect, color, step in zip(
+                self.x[index].astype(np.int32).tolist(), self.y[index].astype(np.int32).tolist(),
+                reach.tolist(), sizes.tolist(), effects.tolist(),
+                self.color[index].tolist(), steps.tolist())
         ]
-        pygame.draw.polygon(screen, self.color, heart_points)
+        return screen.blits(blit_list)
+
+# Atlas de sprites já desenhados, por (efeito, cor, tamanho, passo de rotação),
+# montado sob demanda
+ROTATION_STEPS = 16
+SYMMETRY = np.array([2 * math.pi, 2 * math.pi / 5, math.pi / 3, 2 * math.pi], dtype=np.float32)
+sprite_atlas = {}
+
+def particle_sprite(effect, color, size, step):
+    key = (effect, color, size, step, has_display())
+    sprite = sprite_atlas.get(key)
+    if sprite is None:
+        # Área ocupada (as pétalas da flor passam do raio)
+        reach = size + size // 3 + 1
+        # Fundo preto transparente por colorkey (RLE): mais rápido que alpha por pixel
+        sprite = pygame.Surface((2 * reach, 2 * reach))
+        rotation = step * float(SYMMETRY[effect]) / ROTATION_STEPS
+        color = PALETTE[color]
+        if effect == FIREWORK:
+            pygame.draw.circle(sprite, color, (reach, reach), size)
+        elif effect == STAR:
+            draw_star(sprite, color, reach, reach, size, rotation)
+        elif effect == FLOWER:
+            draw_flower(sprite, color, reach, reach, size, rotation)
+        else:
+            draw_heart(sprite, color, reach, reach, size)
+        sprite = display_format(sprite)
+        sprite.set_colorkey(BLACK, pygame.RLEACCEL)
+        sprite_atlas[key] = sprite
+    return sprite
+
+def draw_star(screen, color, x, y, size, rotation):
+    points = []
+    for i in range(10):
+        angle = (i * math.pi / 5) + rotation
+        if i % 2 == 0:
+            radius = size
+        else:
+            radius = size // 2
+        px = x + math.cos(angle) * radius
+        py = y + math.sin(angle) * radius
+        points.append((px, py))
+    
+    pygame.draw.polygon(screen, color, points)
+
+def draw_flower(screen, color, x, y, size, rotation):
+    for i in range(6):
+        angle = (i * math.pi / 3) + rotation
+        px = x + math.cos(angle) * size
+        py = y + math.sin(angle) * size
+        pygame.draw.circle(screen, color, (int(px), int(py)), size // 3)
+    pygame.draw.circle(screen, WHITE, (x, y), size // 4)
+
+def draw_heart(screen, color, x, y, size):
+    heart_points = [
+        (x, y + size // 2),
+        (x - size // 2, y),
+        (x - size // 4, y - size // 3),
+        (x, y - size // 6),
+        (x + size // 4, y - size // 3),
+        (x + size // 2, y)
+    ]
+    pygame.draw.polygon(screen, color, heart_points)
 
 class MagicButton:
     def __init__(self, x, y, color, effect_type, name):
@@ -184,6 +279,7 @@ class MagicButton:
         
         # Draw icon
         self.draw_icon(screen)
+        return self.rect.inflate(32, 32)
     
     def draw_icon(self, screen):
         center_x, center_y = self.rect.center
@@ -231,12 +327,11 @@ class MagicButton:
                 (center_x + 10, center_y)
             ], 2)
 
-class MagicButtons:
-    def __init__(self):
-        self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT), pygame.FULLSCREEN)
-        pygame.display.set_caption("Botões Mágicos")
-        self.clock = pygame.time.Clock()
-        
+class MagicButtons(Game):
+    caption = "Botões Mágicos"
+    fps = FPS
+
+    def init(self):
         button_start_x = (WINDOW_WIDTH - (4 * BUTTON_SIZE + 3 * BUTTON_SPACING)) // 2
         button_y = WINDOW_HEIGHT - 100
         
@@ -247,79 +342,63 @@ class MagicButtons:
             MagicButton(button_start_x + 3 * (BUTTON_SIZE + BUTTON_SPACING), button_y, RED, "heart", "Corações")
         ]
         
-        self.particles = []
-        self.font = pygame.font.Font(None, 48)
-        self.small_font = pygame.font.Font(None, 24)
+        self.particles = ParticleSystem(MAX_PARTICLES)
         
-        self.background_particles = []
+        self.background_particles = ParticleSystem(64)
         self.bg_particle_timer = 0
+
+        self.sounds = [tones.note(name, BUTTON_SOUND_DURATION) for name in BUTTON_SOUNDS]
         
-    def handle_events(self):
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                return False
+    def handle_event(self, event):
+        if event.type == pygame.QUIT:
+            return False
 
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
-                    return False
-                elif event.key == pygame.K_UP:
-                    self.activate_magic(0)  # Fogos (Amarelo)
-                elif event.key == pygame.K_LEFT:
-                    self.activate_magic(3)  # Corações (Vermelho)
-                elif event.key == pygame.K_DOWN:
-                    self.activate_magic(2)  # Flores (Azul)
-                elif event.key == pygame.K_RIGHT:
-                    self.activate_magic(1)  # Estrelas (Verde)
-                elif event.key == pygame.K_SPACE:
-                    self.clear_all()
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_ESCAPE:
+                return False
+            elif event.key == pygame.K_UP:
+                self.activate_magic(0)  # Fogos (Amarelo)
+            elif event.key == pygame.K_LEFT:
+                self.activate_magic(3)  # Corações (Vermelho)
+            elif event.key == pygame.K_DOWN:
+                self.activate_magic(2)  # Flores (Azul)
+            elif event.key == pygame.K_RIGHT:
+                self.activate_magic(1)  # Estrelas (Verde)
+            elif event.key == pygame.K_SPACE:
+                self.clear_all()
 
         return True
     
     def activate_magic(self, button_index):
         button = self.buttons[button_index]
         button.press()
+        audio.play(BUTTON_SOUNDS[button_index], self.sounds[button_index])
         
         # Create magic particles
         center_x, center_y = button.rect.center
         
         if button.effect_type == "firework":
             # Explosive burst
-            for _ in range(50):
-                particle = Particle(center_x, center_y, YELLOW, "firework")
-                self.particles.append(particle)
+            self.particles.emit("firework", YELLOW, 50, center_x, center_y)
                 
         elif button.effect_type == "star":
             # Floating stars
-            for _ in range(25):
-                x = center_x + random.randint(-100, 100)
-                y = center_y + random.randint(-100, 100)
-                particle = Particle(x, y, GREEN, "star")
-                self.particles.append(particle)
+            self.particles.emit("star", GREEN, 25, center_x, center_y, spread=100)
                 
         elif button.effect_type == "flower":
             # Growing flowers
-            for _ in range(20):
-                x = center_x + random.randint(-150, 150)
-                y = center_y + random.randint(-150, 150)
-                particle = Particle(x, y, BLUE, "flower")
-                self.particles.append(particle)
+            self.particles.emit("flower", BLUE, 20, center_x, center_y, spread=150)
                 
         elif button.effect_type == "heart":
             # Floating hearts
-            for _ in range(30):
-                x = center_x + random.randint(-120, 120)
-                y = center_y + random.randint(-120, 120)
-                particle = Particle(x, y, RED, "heart")
-                self.particles.append(particle)
+            self.particles.emit("heart", RED, 30, center_x, center_y, spread=120)
     
     def update(self, dt):
         for button in self.buttons:
             button.update(dt)
             
         # Update particles
-        self.particles = [p for p in self.particles if p.life > 0]
-        for particle in self.particles:
-            particle.update(dt)
+        self.particles.update(dt)
             
         # Add random background sparkles
         self.bg_particle_timer += dt
@@ -330,44 +409,28 @@ class MagicButtons:
             color = random.choice([YELLOW, GREEN, BLUE, RED, PURPLE, ORANGE])
             effect = random.choice(["star", "heart", "flower"])
             
-            bg_particle = Particle(x, y, color, effect)
-            bg_particle.life = 0.5
-            bg_particle.max_life = 0.5
-            bg_particle.vx = 0
-            bg_particle.vy = 0
-            self.background_particles.append(bg_particle)
+            self.background_particles.emit(effect, color, 1, x, y, life=0.5, still=True)
             
         # Update background particles
-        self.background_particles = [p for p in self.background_particles if p.life > 0]
-        for particle in self.background_particles:
-            particle.update(dt)
+        self.background_particles.update(dt)
     
     def clear_all(self):
         self.particles.clear()
         self.background_particles.clear()
     
-    def draw(self):
-        # Create gradient background
-        for y in range(WINDOW_HEIGHT):
-            color_ratio = y / WINDOW_HEIGHT
-            r = int(20 + (40 - 20) * color_ratio)
-            g = int(20 + (60 - 20) * color_ratio)
-            b = int(60 + (100 - 60) * color_ratio)
-            pygame.draw.line(self.screen, (r, g, b), (0, y), (WINDOW_WIDTH, y))
-        
-        # Draw background sparkles
-        for particle in self.background_particles:
-            particle.draw(self.screen)
+    def draw_static(self, surface):
+        # Gradient background
+        surface.blit(gradient_background(surface.get_size()), (0, 0))
         
         # Draw title
-        title = self.font.render("Botões Mágicos", True, WHITE)
+        title = render_text("Botões Mágicos", 48, WHITE)
         title_rect = title.get_rect(center=(WINDOW_WIDTH // 2, 80))
-        self.screen.blit(title, title_rect)
+        surface.blit(title, title_rect)
 
         # Draw instruction
-        instruction = self.small_font.render("Aperte as setas para criar magia!", True, WHITE)
+        instruction = render_text("Aperte as setas para criar magia!", 24, WHITE)
         inst_rect = instruction.get_rect(center=(WINDOW_WIDTH // 2, 120))
-        self.screen.blit(instruction, inst_rect)
+        surface.blit(instruction, inst_rect)
 
         # Draw controls
         controls = [
@@ -377,33 +440,24 @@ class MagicButtons:
             ("→ Estrelas", GREEN)
         ]
         for i, (control, color) in enumerate(controls):
-            text = self.small_font.render(control, True, color)
-            self.screen.blit(text, (20, 20 + i * 30))
+            text = render_text(control, 24, color)
+            surface.blit(text, (20, 20 + i * 30))
 
-        clear_text = self.small_font.render("ESPAÇO - Limpar", True, WHITE)
-        self.screen.blit(clear_text, (20, 140))
+        clear_text = render_text("ESPAÇO - Limpar", 24, WHITE)
+        surface.blit(clear_text, (20, 140))
+
+    def draw(self):
+        # Draw background sparkles
+        for rect in self.background_particles.draw(self.screen):
+            self.mark(rect)
         
         # Draw magic particles
-        for particle in self.particles:
-            particle.draw(self.screen)
+        for rect in self.particles.draw(self.screen):
+            self.mark(rect)
             
         # Draw buttons
         for button in self.buttons:
-            button.draw(self.screen)
-            
-        pygame.display.flip()
-    
-    def run(self):
-        running = True
-        while running:
-            dt = self.clock.tick(FPS) / 1000.0
-            running = self.handle_events()
-            self.update(dt)
-            self.draw()
-        
-        pygame.quit()
-        sys.exit()
+            self.mark(button.draw(self.screen))
 
 if __name__ == "__main__":
-    game = MagicButtons()
-    game.run()
\ No newline at end of file
+    main(MagicButtons)
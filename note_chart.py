@@ -0,0 +1,115 @@
+import os
+import json
+import random
+from array import array
+from bisect import bisect_left, bisect_right
+
+LANES = 4
+
+
+class Chart:
+    """Notas de uma música, por pista, em arrays ordenados pelo tempo (em
+    segundos desde o início da música). Cada nota tem tempo, duração
+    (0 = nota simples) e a marca de acerto.
+
+    As buscas são binárias, então o custo por frame não depende do tamanho
+    da música.
+    """
+
+    def __init__(self, lanes=LANES):
+        self.times = [array("d") for _ in range(lanes)]
+        self.durations = [array("d") for _ in range(lanes)]
+        self.hit = [bytearray() for _ in range(lanes)]
+        # Notas antes deste índice já foram julgadas (acertadas ou perdidas)
+        self.judged = [0] * lanes
+        # Notas longas de cada pista (índices, em ordem de tempo) e as que
+        # começaram antes do último `start` de visible() mas ainda não acabaram
+        self.holds = [array("l") for _ in range(lanes)]
+        self.next_hold = [0] * lanes
+        self.active_holds = [[] for _ in range(lanes)]
+        self.last_start = [float("-inf")] * lanes
+        self.end_time = 0.0
+        self.audio = None  # arquivo de áudio da música, se houver
+
+    def __len__(self):
+        return sum(len(times) for times in self.times)
+
+    def add(self, lane, time, duration=0.0):
+        # As notas de cada pista precisam chegar em ordem de tempo
+        self.times[lane].append(time)
+        self.durations[lane].append(duration)
+        self.hit[lane].append(0)
+        if duration > 0:
+            self.holds[lane].append(len(self.times[lane]) - 1)
+        self.end_time = max(self.end_time, time)
+
+    def find_hit(self, lane, time, window):
+        # Primeira nota não acertada dentro da janela de julgamento; marca e devolve o índice
+        times = self.times[lane]
+        i = max(bisect_left(times, time - window), self.judged[lane])
+        while i < len(times) and times[i] <= time + window:
+            if not self.hit[lane][i]:
+                self.hit[lane][i] = 1
+                return i
+            i += 1
+        return None
+
+    def expire(self, time):
+        # Julga as notas que passaram de `time`; devolve quantas foram perdidas
+        missed = 0
+        for lane, times in enumerate(self.times):
+            i = self.judged[lane]
+            hit = self.hit[lane]
+            while i < len(times) and times[i] < time:
+                if not hit[i]:
+                    missed += 1
+                i += 1
+            self.judged[lane] = i
+        return missed
+
+    def visible(self, lane, start, end):
+        # Índices das notas da pista que ocupam algum tempo entre start e end:
+        # a cabeça dentro da janela ou o rastro de uma nota longa ainda nela
+        times = self.times[lane]
+        durations = self.durations[lane]
+        holds = self.holds[lane]
+        if start < self.last_start[lane]:
+            # No jogo o início da janela só avança; se voltar, refaz a varredura
+            self.next_hold[lane] = 0
+            self.active_holds[lane] = []
+        self.last_start[lane] = start
+
+        k = self.next_hold[lane]
+        active = self.active_holds[lane]
+        while k < len(holds) and times[holds[k]] < start:
+            active.append(holds[k])
+            k += 1
+        self.next_hold[lane] = k
+        active[:] = [i for i in active if times[i] + durations[i] >= start]
+        return active + list(range(bisect_left(times, start), bisect_right(times, end)))
+
+
+def load_chart(path, lanes=LANES):
+    """Lê um arquivo JSON: {"audio": "musica.ogg", "notes": [{"lane": 0,
+    "time": 1.5, "duration": 0}, ...]}; o áudio é opcional e relativo ao JSON."""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+
+    chart = Chart(lanes)
+    for note in sorted(data["notes"], key=lambda note: note["time"]):
+        lane = note["lane"]
+        if not isinstance(lane, int) or not 0 <= lane < lanes:
+            raise ValueError(f"{path}: nota em {note['time']} s na pista {lane!r}, "
+                             f"mas as pistas vão de 0 a {lanes - 1}")
+        chart.add(lane, note["time"], note.get("duration", 0.0))
+    if data.get("audio"):
+        chart.audio = os.path.join(os.path.dirname(os.path.abspath(path)), data["audio"])
+    return chart
+
+
+def random_notes(start=1.0):
+    # Gerador de música aleatória: uma nota a cada 0,8–2,0 s em pista sorteada
+    time = start
+    while True:
+        yield random.randint(0, LANES - 1), time
+        time += random.uniform(0.8, 2.0)
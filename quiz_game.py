@@ -1,5 +1,7 @@
 import pygame
-import sys
+
+from game_base import Game, main
+from text_cache import render_text
 
 pygame.init()
 
@@ -21,17 +23,11 @@ GRAY = (100, 100, 100)
 LIGHT_GRAY = (200, 200, 200)
 DARK_GRAY = (50, 50, 50)
 
-class QuizGame:
-    def __init__(self):
-        self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT), pygame.FULLSCREEN)
-        pygame.display.set_caption("Quiz de Privacidade e Proteção de Dados")
-        self.clock = pygame.time.Clock()
-
-        self.font_title = pygame.font.Font(None, 48)
-        self.font_question = pygame.font.Font(None, 40)
-        self.font_button = pygame.font.Font(None, 32)
-        self.font_small = pygame.font.Font(None, 24)
+class QuizGame(Game):
+    caption = "Quiz de Privacidade e Proteção de Dados"
+    fps = FPS
 
+    def init(self):
         # Perguntas do quiz com a estrutura correta
         # Azul (CIMA) = Dica
         # Verde (DIREITA) = OK, pode compartilhar
@@ -158,40 +154,39 @@ class QuizGame:
         self.feedback_explanation = ""
         self.is_correct = False
 
-    def handle_events(self):
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
+    def handle_event(self, event):
+        if event.type == pygame.QUIT:
+            return False
+
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_ESCAPE:
                 return False
 
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
+            if not self.game_over:
+                # Seta CIMA = Azul (Dica)
+                if event.key == pygame.K_UP:
+                    self.toggle_tip()
+                # Seta ESQUERDA = Laranja (resposta)
+                elif event.key == pygame.K_LEFT:
+                    if not self.answered:
+                        self.submit_answer("orange")
+                # Seta BAIXO = Amarelo (resposta)
+                elif event.key == pygame.K_DOWN:
+                    if not self.answered:
+                        self.submit_answer("yellow")
+                # Seta DIREITA = Verde (resposta OK)
+                elif event.key == pygame.K_RIGHT:
+                    if not self.answered:
+                        self.submit_answer("green")
+            else:
+                # Qualquer tecla na tela de game over avança
+                if event.key in [pygame.K_UP, pygame.K_DOWN, pygame.K_LEFT, pygame.K_RIGHT, pygame.K_SPACE, pygame.K_RETURN]:
                     return False
 
-                if not self.game_over:
-                    # Seta CIMA = Azul (Dica)
-                    if event.key == pygame.K_UP:
-                        self.show_tip = not self.show_tip
-                    # Seta ESQUERDA = Laranja (resposta)
-                    elif event.key == pygame.K_LEFT:
-                        if not self.answered:
-                            self.submit_answer("orange")
-                    # Seta BAIXO = Amarelo (resposta)
-                    elif event.key == pygame.K_DOWN:
-                        if not self.answered:
-                            self.submit_answer("yellow")
-                    # Seta DIREITA = Verde (resposta OK)
-                    elif event.key == pygame.K_RIGHT:
-                        if not self.answered:
-                            self.submit_answer("green")
-                else:
-                    # Qualquer tecla na tela de game over avança
-                    if event.key in [pygame.K_UP, pygame.K_DOWN, pygame.K_LEFT, pygame.K_RIGHT, pygame.K_SPACE, pygame.K_RETURN]:
-                        return False
-
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                if not self.game_over and not self.answered:
-                    mouse_x, mouse_y = pygame.mouse.get_pos()
-                    self.check_click(mouse_x, mouse_y)
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            if not self.game_over and not self.answered:
+                mouse_x, mouse_y = event.pos
+                self.check_click(mouse_x, mouse_y)
 
         return True
 
@@ -205,7 +200,7 @@ class QuizGame:
         # Botão CIMA (Azul - Dica)
         blue_rect = pygame.Rect(center_x - button_size // 2, center_y - 150, button_size, button_size)
         if blue_rect.collidepoint(mouse_x, mouse_y):
-            self.show_tip = not self.show_tip
+            self.toggle_tip()
             return
 
         # Botão ESQUERDA (Laranja)
@@ -226,6 +221,10 @@ class QuizGame:
             self.submit_answer("green")
             return
 
+    def toggle_tip(self):
+        self.show_tip = not self.show_tip
+        self.renderer.invalidate()
+
     def submit_answer(self, answer_key):
         if self.answered:
             return
@@ -244,10 +243,12 @@ class QuizGame:
 
         # Armazenar explicação da resposta
         self.feedback_explanation = question["answers"][answer_key]["explanation"]
-        self.feedback_timer = 240  # 4 segundos a 60 FPS para ler a explicação
+        self.feedback_timer = 4.0  # 4 segundos para ler a explicação
+        self.renderer.invalidate()
 
     def next_question(self):
         self.current_question += 1
+        self.renderer.invalidate()
 
         if self.current_question >= len(self.questions):
             self.game_over = True
@@ -258,29 +259,35 @@ class QuizGame:
             self.feedback_text = ""
             self.feedback_explanation = ""
 
-    def draw(self):
-        self.screen.fill(DARK_GRAY)
+    def update(self, dt):
+        if self.answered and not self.game_over:
+            self.feedback_timer -= dt
+            if self.feedback_timer <= 0:
+                # Avança para próxima pergunta
+                self.next_question()
 
+    def draw_static(self, surface):
+        # A tela só muda com o estado (pergunta, dica, resposta, fim): tudo
+        # fica na camada estática, refeita por renderer.invalidate()
+        surface.fill(DARK_GRAY)
         if self.game_over:
-            self.draw_game_over()
+            self.draw_game_over(surface)
         else:
-            self.draw_question()
-
-        pygame.display.flip()
+            self.draw_question(surface)
 
-    def draw_game_over(self):
+    def draw_game_over(self, surface):
         # Título
-        title_text = self.font_title.render("Quiz Concluído!", True, WHITE)
+        title_text = render_text("Quiz Concluído!", 48, WHITE)
         title_rect = title_text.get_rect(center=(WINDOW_WIDTH // 2, 150))
-        self.screen.blit(title_text, title_rect)
+        surface.blit(title_text, title_rect)
 
         # Pontuação
-        score_text = self.font_question.render(
+        score_text = render_text(
             f"Sua pontuação: {self.score}/{len(self.questions)}",
-            True, WHITE
+            40, WHITE
         )
         score_rect = score_text.get_rect(center=(WINDOW_WIDTH // 2, 300))
-        self.screen.blit(score_text, score_rect)
+        surface.blit(score_text, score_rect)
 
         # Mensagem de acordo com pontuação
         percentage = (self.score / len(self.questions)) * 100
@@ -297,48 +304,48 @@ class QuizGame:
             msg = "Continue aprendendo sobre privacidade e segurança!"
             color = RED
 
-        msg_text = self.font_button.render(msg, True, color)
+        msg_text = render_text(msg, 32, color)
         msg_rect = msg_text.get_rect(center=(WINDOW_WIDTH // 2, 400))
-        self.screen.blit(msg_text, msg_rect)
+        surface.blit(msg_text, msg_rect)
 
         # Instruções
-        inst_text = self.font_small.render("Pressione qualquer seta para sair", True, LIGHT_GRAY)
+        inst_text = render_text("Pressione qualquer seta para sair", 24, LIGHT_GRAY)
         inst_rect = inst_text.get_rect(center=(WINDOW_WIDTH // 2, 550))
-        self.screen.blit(inst_text, inst_rect)
+        surface.blit(inst_text, inst_rect)
 
-    def draw_question(self):
+    def draw_question(self, surface):
         question = self.questions[self.current_question]
 
         # Número da pergunta
-        q_num_text = self.font_small.render(
+        q_num_text = render_text(
             f"Pergunta {self.current_question + 1}/{len(self.questions)}",
-            True, LIGHT_GRAY
+            24, LIGHT_GRAY
         )
         q_num_rect = q_num_text.get_rect(topleft=(20, 20))
-        self.screen.blit(q_num_text, q_num_rect)
+        surface.blit(q_num_text, q_num_rect)
 
         # Pontuação
-        score_text = self.font_small.render(
+        score_text = render_text(
             f"Acertos: {self.score}",
-            True, GREEN
+            24, GREEN
         )
         score_rect = score_text.get_rect(topright=(WINDOW_WIDTH - 20, 20))
-        self.screen.blit(score_text, score_rect)
+        surface.blit(score_text, score_rect)
 
         # Pergunta (no topo)
-        question_text = self.font_question.render(question["question"], True, WHITE)
+        question_text = render_text(question["question"], 40, WHITE)
         question_rect = question_text.get_rect(center=(WINDOW_WIDTH // 2, 80))
-        self.screen.blit(question_text, question_rect)
+        surface.blit(question_text, question_rect)
 
         # Dica (se ativada)
         if self.show_tip:
             tip_bg = pygame.Rect(50, 160, WINDOW_WIDTH - 100, 100)
-            pygame.draw.rect(self.screen, BLUE, tip_bg)
-            pygame.draw.rect(self.screen, WHITE, tip_bg, 3)
+            pygame.draw.rect(surface, BLUE, tip_bg)
+            pygame.draw.rect(surface, WHITE, tip_bg, 3)
 
-            tip_text = self.font_small.render(question["tip"], True, WHITE)
+            tip_text = render_text(question["tip"], 24, WHITE)
             tip_rect = tip_text.get_rect(center=tip_bg.center)
-            self.screen.blit(tip_text, tip_rect)
+            surface.blit(tip_text, tip_rect)
 
         # D-Pad com 4 botões (em formato de cruz, azul na cima)
         center_x = WINDOW_WIDTH // 2
@@ -378,91 +385,73 @@ class QuizGame:
             if self.answered and key in ["green", "yellow", "orange"]:
                 if question["answers"][key]["correct"]:
                     # Resposta correta - borda grossa
-                    pygame.draw.rect(self.screen, btn_data["color"], button_rect)
-                    pygame.draw.rect(self.screen, WHITE, button_rect, 4)
+                    pygame.draw.rect(surface, btn_data["color"], button_rect)
+                    pygame.draw.rect(surface, WHITE, button_rect, 4)
                 else:
                     # Resposta errada - escurece
                     dimmed_color = tuple(int(c * 0.6) for c in btn_data["color"])
-                    pygame.draw.rect(self.screen, dimmed_color, button_rect)
-                    pygame.draw.rect(self.screen, WHITE, button_rect, 2)
+                    pygame.draw.rect(surface, dimmed_color, button_rect)
+                    pygame.draw.rect(surface, WHITE, button_rect, 2)
             else:
-                pygame.draw.rect(self.screen, btn_data["color"], button_rect)
-                pygame.draw.rect(self.screen, WHITE, button_rect, 3)
+                pygame.draw.rect(surface, btn_data["color"], button_rect)
+                pygame.draw.rect(surface, WHITE, button_rect, 3)
 
             # Texto do botão (maior e centrado)
-            text = self.font_button.render(btn_data["label"], True, BLACK)
+            text = render_text(btn_data["label"], 32, BLACK)
             text_rect = text.get_rect(center=button_rect.center)
-            self.screen.blit(text, text_rect)
+            surface.blit(text, text_rect)
 
             # Setas de instrução acima/abaixo/lado do botão
-            arrow_font = pygame.font.Font(None, 24)
             if key == "blue":
-                arrow = arrow_font.render("↑", True, WHITE)
+                arrow = render_text("↑", 24, WHITE)
                 arrow_rect = arrow.get_rect(center=(button_rect.centerx, button_rect.top - 20))
-                self.screen.blit(arrow, arrow_rect)
+                surface.blit(arrow, arrow_rect)
             elif key == "orange":
-                arrow = arrow_font.render("←", True, WHITE)
+                arrow = render_text("←", 24, WHITE)
                 arrow_rect = arrow.get_rect(center=(button_rect.left - 20, button_rect.centery))
-                self.screen.blit(arrow, arrow_rect)
+                surface.blit(arrow, arrow_rect)
             elif key == "yellow":
-                arrow = arrow_font.render("↓", True, WHITE)
+                arrow = render_text("↓", 24, WHITE)
                 arrow_rect = arrow.get_rect(center=(button_rect.centerx, button_rect.bottom + 20))
-                self.screen.blit(arrow, arrow_rect)
+                surface.blit(arrow, arrow_rect)
             elif key == "green":
-                arrow = arrow_font.render("→", True, WHITE)
+                arrow = render_text("→", 24, WHITE)
                 arrow_rect = arrow.get_rect(center=(button_rect.right + 20, button_rect.centery))
-                self.screen.blit(arrow, arrow_rect)
+                surface.blit(arrow, arrow_rect)
 
         # Feedback
-        if self.answered:
-            if self.feedback_timer > 0:
-                # Fundo semi-transparente para feedback
-                feedback_bg = pygame.Rect(50, 250, WINDOW_WIDTH - 100, 150)
-                pygame.draw.rect(self.screen, BLACK, feedback_bg)
-                pygame.draw.rect(self.screen, WHITE, feedback_bg, 2)
-
-                # Texto de acerto/erro
-                feedback_color = GREEN if self.is_correct else RED
-                feedback_text = self.font_title.render(
-                    self.feedback_text,
-                    True,
-                    feedback_color
-                )
-                feedback_rect = feedback_text.get_rect(center=(WINDOW_WIDTH // 2, 270))
-                self.screen.blit(feedback_text, feedback_rect)
-
-                # Explicação da resposta
-                explanation_text = self.font_small.render(
-                    self.feedback_explanation,
-                    True,
-                    WHITE
-                )
-                explanation_rect = explanation_text.get_rect(center=(WINDOW_WIDTH // 2, 330))
-                self.screen.blit(explanation_text, explanation_rect)
-
-                self.feedback_timer -= 1
-            else:
-                # Avança para próxima pergunta
-                self.next_question()
+        if self.answered and self.feedback_timer > 0:
+            # Fundo semi-transparente para feedback
+            feedback_bg = pygame.Rect(50, 250, WINDOW_WIDTH - 100, 150)
+            pygame.draw.rect(surface, BLACK, feedback_bg)
+            pygame.draw.rect(surface, WHITE, feedback_bg, 2)
+
+            # Texto de acerto/erro
+            feedback_color = GREEN if self.is_correct else RED
+            feedback_text = render_text(
+                self.feedback_text,
+                48,
+                feedback_color
+            )
+            feedback_rect = feedback_text.get_rect(center=(WINDOW_WIDTH // 2, 270))
+            surface.blit(feedback_text, feedback_rect)
+
+            # Explicação da resposta
+            explanation_text = render_text(
+                self.feedback_explanation,
+                24,
+                WHITE
+            )
+            explanation_rect = explanation_text.get_rect(center=(WINDOW_WIDTH // 2, 330))
+            surface.blit(explanation_text, explanation_rect)
 
         # Instruções na parte inferior
-        inst_text = self.font_small.render(
+        inst_text = render_text(
             "Aperte as SETAS DIRECIONAIS para responder",
-            True, LIGHT_GRAY
+            24, LIGHT_GRAY
         )
         inst_rect = inst_text.get_rect(center=(WINDOW_WIDTH // 2, 650))
-        self.screen.blit(inst_text, inst_rect)
-
-    def run(self):
-        running = True
-        while running:
-            running = self.handle_events()
-            self.draw()
-            self.clock.tick(FPS)
-
-        pygame.quit()
-        sys.exit()
+        surface.blit(inst_text, inst_rect)
 
 if __name__ == "__main__":
-    game = QuizGame()
-    game.run()
+    main(QuizGame)
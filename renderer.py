@@ -0,0 +1,70 @@
+import pygame
+
+
+def has_display():
+    return pygame.display.get_surface() is not None
+
+
+def display_format(surface):
+    # Converte para o formato da tela (blit mais rápido), se já houver uma;
+    # sem tela (simulação, benchmark) devolve a própria superfície. Caches
+    # de sprites põem has_display() na chave para refazer o que foi criado
+    # antes da tela existir.
+    if has_display():
+        return surface.convert()
+    return surface
+
+
+class Renderer:
+    """Compõe cada frame sobre uma camada estática em cache.
+
+    No modo normal a camada é copiada inteira e a tela é trocada com flip().
+    No modo de retângulos sujos (dirty) só as regiões marcadas no frame
+    anterior são restauradas, e só elas e as do frame atual são enviadas
+    com pygame.display.update(rects).
+    """
+
+    def __init__(self, screen, draw_static, dirty=False):
+        self.screen = screen
+        self.draw_static = draw_static
+        self.dirty = dirty
+        self.background = None
+        self.rects = []
+        self.previous = []
+        self.full_redraw = True
+
+    def build_background(self):
+        background = display_format(pygame.Surface(self.screen.get_size()))
+        self.draw_static(background)
+        return background
+
+    def invalidate(self):
+        # A camada estática mudou: refaz no próximo frame e redesenha tudo
+        self.background = None
+        self.full_redraw = True
+
+    def begin(self):
+        if self.background is None:
+            self.background = self.build_background()
+            self.full_redraw = True
+
+        if self.full_redraw or not self.dirty:
+            self.screen.blit(self.background, (0, 0))
+        else:
+            for rect in self.previous:
+                self.screen.blit(self.background, rect, rect)
+        self.rects = []
+
+    def mark(self, rect):
+        if self.dirty and rect is not None:
+            # Cópia: os jogos devolvem o próprio rect, que muda no update seguinte
+            self.rects.append(pygame.Rect(rect))
+        return rect
+
+    def present(self):
+        if self.full_redraw or not self.dirty:
+            pygame.display.flip()
+        else:
+            pygame.display.update(self.previous + self.rects)
+        self.previous = self.rects
+        self.full_redraw = False
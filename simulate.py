@@ -0,0 +1,66 @@
+import os
+import time
+import random
+import argparse
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+from game_selector import GAMES, load_game
+
+KEYS = [pygame.K_UP, pygame.K_DOWN, pygame.K_LEFT, pygame.K_RIGHT, pygame.K_SPACE]
+
+
+def random_inputs(held, press_chance):
+    # Solta as teclas do passo anterior e, às vezes, aperta uma nova
+    events = [pygame.event.Event(pygame.KEYUP, key=key) for key in held]
+    held.clear()
+    if random.random() < press_chance:
+        key = random.choice(KEYS)
+        held.append(key)
+        events.append(pygame.event.Event(pygame.KEYDOWN, key=key))
+    return events
+
+
+def simulate(entry, frames, dt, press_chance, render_every):
+    game_class = load_game(entry)
+    game = game_class.headless()
+    held = []
+    restarts = 0
+
+    start = time.perf_counter()
+    for frame in range(frames):
+        if not game.step(random_inputs(held, press_chance), dt):
+            # O jogo pediu para sair (ex.: fim do quiz): recomeça
+            game = game_class.headless()
+            restarts += 1
+        if render_every and frame % render_every == 0:
+            game.render()
+    elapsed = time.perf_counter() - start
+
+    return frames / elapsed, restarts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulação sem tela, em passo fixo, de todos os jogos")
+    parser.add_argument("--frames", type=int, default=10000)
+    parser.add_argument("--fps", type=int, default=60)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--press-chance", type=float, default=0.2)
+    parser.add_argument("--render-every", type=int, default=0, help="chama render() a cada N passos (0 = nunca)")
+    parser.add_argument("--game", help="arquivo do jogo (ex.: snake_game.py); padrão: todos")
+    args = parser.parse_args()
+
+    pygame.init()
+    for entry in GAMES:
+        if args.game and entry["file"] != args.game:
+            continue
+        random.seed(args.seed)
+        rate, restarts = simulate(entry, args.frames, 1.0 / args.fps, args.press_chance, args.render_every)
+        print(f"{entry['file']:<18} {rate:10.0f} frames/s  ({restarts} restarts)")
+
+
+if __name__ == "__main__":
+    main()
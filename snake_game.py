@@ -1,6 +1,11 @@
 import pygame
-import sys
 import random
+import sys
+from array import array
+from collections import deque
+
+from game_base import Game, main
+from text_cache import render_text
 
 pygame.init()
 
@@ -8,7 +13,18 @@ pygame.init()
 info = pygame.display.Info()
 WINDOW_WIDTH = info.current_w
 WINDOW_HEIGHT = info.current_h
-FPS = 5
+FPS = 60  # entrada e desenho
+TICK_RATE = 5  # passos da cobra por segundo (a velocidade do jogo)
+MOVE_INTERVAL = 1.0 / TICK_RATE  # segundos entre passos da cobra
+MAX_TURNS = 3  # curvas guardadas para os próximos passos
+MAX_PENDING = 64  # células pendentes antes de desistir e redesenhar tudo
+
+DIRECTIONS = {
+    pygame.K_LEFT: (-1, 0),
+    pygame.K_RIGHT: (1, 0),
+    pygame.K_UP: (0, 1),
+    pygame.K_DOWN: (0, -1)
+}
 
 GRID_SIZE = 20
 GRID_WIDTH = WINDOW_WIDTH // GRID_SIZE
@@ -22,72 +38,116 @@ WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
 DARK_GREEN = (0, 150, 0)
 
-class SnakeGame:
-    def __init__(self):
-        self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT), pygame.FULLSCREEN)
-        pygame.display.set_caption("Jogo da Cobrinha - 4 Cores")
-        self.clock = pygame.time.Clock()
-        
-        self.snake = [(GRID_WIDTH // 2, GRID_HEIGHT // 2)]
-        self.direction = (1, 0)
-        self.food = self.spawn_food()
-        self.score = 0
-        self.game_over = False
-        
-        self.font = pygame.font.Font(None, 36)
-        self.small_font = pygame.font.Font(None, 24)
+class SnakeGame(Game):
+    caption = "Jogo da Cobrinha - 4 Cores"
+    fps = FPS
+    interpolate = False  # desliza cabeça e cauda entre as células
+
+    def init(self):
+        self.reset_game()
+
+    def reset_board(self):
+        # Ocupação por célula (índice y * GRID_WIDTH + x) e índice das células
+        # livres: lista com troca-e-remove + posição de cada célula nela (-1 = ocupada)
+        cells = GRID_WIDTH * GRID_HEIGHT
+        self.occupied = bytearray(cells)
+        self.free = array("i", range(cells))
+        self.free_pos = array("i", range(cells))
+
+    def occupy(self, x, y):
+        cell = y * GRID_WIDTH + x
+        self.occupied[cell] = 1
+        index = self.free_pos[cell]
+        last = self.free.pop()
+        if last != cell:
+            self.free[index] = last
+            self.free_pos[last] = index
+        self.free_pos[cell] = -1
+
+    def release(self, x, y):
+        cell = y * GRID_WIDTH + x
+        self.occupied[cell] = 0
+        self.free_pos[cell] = len(self.free)
+        self.free.append(cell)
         
     def spawn_food(self):
-        while True:
-            food = (random.randint(0, GRID_WIDTH - 1), random.randint(0, GRID_HEIGHT - 1))
-            if food not in self.snake:
-                return food
+        # Sorteio uniforme entre as células livres, sem tentativas repetidas
+        if not self.free:
+            return None
+        cell = self.free[random.randrange(len(self.free))]
+        return (cell % GRID_WIDTH, cell // GRID_WIDTH)
     
-    def handle_events(self):
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                return False
+    def handle_event(self, event):
+        if event.type == pygame.QUIT:
+            return False
 
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
-                    return False
-                elif self.game_over:
-                    if event.key == pygame.K_SPACE:
-                        self.reset_game()
-                else:
-                    if event.key == pygame.K_LEFT and self.direction != (1, 0):
-                        self.direction = (-1, 0)
-                    elif event.key == pygame.K_RIGHT and self.direction != (-1, 0):
-                        self.direction = (1, 0)
-                    elif event.key == pygame.K_UP and self.direction != (0, -1):
-                        self.direction = (0, 1)
-                    elif event.key == pygame.K_DOWN and self.direction != (0, 1):
-                        self.direction = (0, -1)
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_ESCAPE:
+                return False
+            elif self.game_over:
+                if event.key == pygame.K_SPACE:
+                    self.reset_game()
+            elif event.key in DIRECTIONS:
+                self.queue_turn(DIRECTIONS[event.key])
 
         return True
     
-    def update(self):
+    def queue_turn(self, direction):
+        # Duas teclas no mesmo passo viram duas curvas, uma por passo; a
+        # validação é contra a última direção da fila, não a atual
+        last = self.turns[-1] if self.turns else self.direction
+        if direction in (last, (-last[0], -last[1])) or len(self.turns) >= MAX_TURNS:
+            return
+        self.turns.append(direction)
+
+    def update(self, dt):
         if self.game_over:
             return
-            
+
+        self.move_timer += dt
+        while self.move_timer >= MOVE_INTERVAL and not self.game_over:
+            self.move_timer -= MOVE_INTERVAL
+            self.move()
+
+    def move(self):
+        if self.turns:
+            self.direction = self.turns.popleft()
         head_x, head_y = self.snake[0]
         new_head = (head_x + self.direction[0], head_y + self.direction[1])
         
         if (new_head[0] < 0 or new_head[0] >= GRID_WIDTH or 
             new_head[1] < 0 or new_head[1] >= GRID_HEIGHT or
-            new_head in self.snake):
+            self.occupied[new_head[1] * GRID_WIDTH + new_head[0]]):
             self.game_over = True
             return
         
-        self.snake.insert(0, new_head)
+        self.snake.appendleft(new_head)
+        self.occupy(*new_head)
+        self.touch("snake", *new_head)
         
         if new_head == self.food:
             self.score += 10
             self.food = self.spawn_food()
+            if self.food is None:
+                # Tabuleiro cheio: não há onde pôr comida
+                self.game_over = True
+            else:
+                self.touch("food", *self.food)
         else:
-            self.snake.pop()
+            tail = self.snake.pop()
+            self.release(*tail)
+            self.touch("clear", *tail)
+
+    def touch(self, kind, x, y):
+        # Célula que mudou desde o último desenho (cabeça, cauda ou comida)
+        if len(self.pending) >= MAX_PENDING:
+            # Muitos passos sem desenhar (ex.: simulação): refaz a camada inteira
+            self.pending = []
+            self.renderer.invalidate()
+        elif self.renderer.background is not None:
+            self.pending.append((kind, x, y))
     
-    def draw_control_guide(self):
+    def draw_control_guide(self, surface):
         # Control scheme: ↑ Amarelo (UP), ← Vermelho (LEFT), ↓ Azul (DOWN), → Verde (RIGHT)
         controls = [
             ("↑ Amarelo", YELLOW, 50, 50),
@@ -97,57 +157,108 @@ class SnakeGame:
         ]
 
         for text_label, color, x, y in controls:
-            pygame.draw.circle(self.screen, color, (x, y), 15)
-            text = self.small_font.render(text_label, True, BLACK)
+            pygame.draw.circle(surface, color, (x, y), 15)
+            text = render_text(text_label, 24, BLACK)
             text_rect = text.get_rect(center=(x, y))
-            self.screen.blit(text, text_rect)
+            surface.blit(text, text_rect)
+
+    def draw_static(self, surface):
+        # A camada estática é o tabuleiro persistente: fundo, guia, cobra e
+        # comida; depois disso só as células que mudam são repintadas nela
+        surface.fill(BLACK)
+        self.draw_control_guide(surface)
+        self.clean = surface.copy()
+
+        for x, y in self.snake:
+            self.draw_segment(surface, x, y)
+        if self.food is not None:
+            self.draw_food(surface, *self.food)
+        self.pending = []
     
+    def draw_segment(self, surface, x, y, offset=(0, 0)):
+        rect = pygame.Rect(x * GRID_SIZE + offset[0], y * GRID_SIZE + offset[1], GRID_SIZE, GRID_SIZE)
+        pygame.draw.rect(surface, DARK_GREEN, rect)
+        pygame.draw.rect(surface, GREEN, rect, 2)
+        return rect
+
+    def draw_food(self, surface, x, y):
+        return pygame.draw.rect(surface, RED, pygame.Rect(x * GRID_SIZE, y * GRID_SIZE, GRID_SIZE, GRID_SIZE))
+
     def draw(self):
-        self.screen.fill(BLACK)
-        
-        for x, y in self.snake:
+        background = self.renderer.background
+        for kind, x, y in self.pending:
             rect = pygame.Rect(x * GRID_SIZE, y * GRID_SIZE, GRID_SIZE, GRID_SIZE)
-            pygame.draw.rect(self.screen, DARK_GREEN, rect)
-            pygame.draw.rect(self.screen, GREEN, rect, 2)
-        
-        food_rect = pygame.Rect(self.food[0] * GRID_SIZE, self.food[1] * GRID_SIZE, GRID_SIZE, GRID_SIZE)
-        pygame.draw.rect(self.screen, RED, food_rect)
-        
-        score_text = self.font.render(f"Pontuação: {self.score}", True, WHITE)
-        self.screen.blit(score_text, (WINDOW_WIDTH - 150, 20))
+            if kind == "snake":
+                self.draw_segment(background, x, y)
+            elif kind == "food":
+                self.draw_food(background, x, y)
+            else:
+                background.blit(self.clean, rect, rect)
+            self.mark(self.screen.blit(background, rect, rect))
+        self.pending = []
+
+        if self.interpolate and not self.game_over:
+            # Fração do passo atual: a cabeça avança rumo à próxima célula e
+            # a cauda recua rumo ao segmento seguinte
+            alpha = self.move_timer / MOVE_INTERVAL
+            if len(self.snake) > 1:
+                # Apaga (com o fundo) a parte da cauda que já ficou para trás
+                tail_x, tail_y = self.snake[-1]
+                next_x, next_y = self.snake[-2]
+                gone = int(alpha * GRID_SIZE)
+                strip = pygame.Rect(tail_x * GRID_SIZE, tail_y * GRID_SIZE, GRID_SIZE, GRID_SIZE)
+                if next_x > tail_x:
+                    strip.width = gone
+                elif next_x < tail_x:
+                    strip.left += GRID_SIZE - gone
+                    strip.width = gone
+                elif next_y > tail_y:
+                    strip.height = gone
+                else:
+                    strip.top += GRID_SIZE - gone
+                    strip.height = gone
+                self.mark(self.screen.blit(self.clean, strip, strip))
+
+            dx, dy = self.turns[0] if self.turns else self.direction
+            head_x, head_y = self.snake[0]
+            offset = (int(dx * alpha * GRID_SIZE), int(dy * alpha * GRID_SIZE))
+            self.mark(self.draw_segment(self.screen, head_x, head_y, offset))
         
-        self.draw_control_guide()
+        # O placar fica por cima do tabuleiro; só é marcado quando muda
+        score_text = render_text(f"Pontuação: {self.score}", 36, WHITE)
+        score_rect = score_text.get_rect(topleft=(WINDOW_WIDTH - 150, 20))
+        # Texto com alpha: repõe o fundo antes, senão o blit repetido acumula
+        self.screen.blit(background, score_rect, score_rect)
+        self.screen.blit(score_text, score_rect)
+        if self.score != self.drawn_score:
+            self.drawn_score = self.score
+            self.mark(score_rect)
         
         if self.game_over:
-            game_over_text = self.font.render("FIM DE JOGO", True, WHITE)
-            restart_text = self.small_font.render("Pressione ESPAÇO para reiniciar", True, WHITE)
+            game_over_text = render_text("FIM DE JOGO", 36, WHITE)
+            restart_text = render_text("Pressione ESPAÇO para reiniciar", 24, WHITE)
             
             game_over_rect = game_over_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2 - 20))
             restart_rect = restart_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2 + 20))
             
-            self.screen.blit(game_over_text, game_over_rect)
-            self.screen.blit(restart_text, restart_rect)
-        
-        pygame.display.flip()
-    
+            self.mark(self.screen.blit(game_over_text, game_over_rect))
+            self.mark(self.screen.blit(restart_text, restart_rect))
+
     def reset_game(self):
-        self.snake = [(GRID_WIDTH // 2, GRID_HEIGHT // 2)]
+        self.reset_board()
+        self.snake = deque([(GRID_WIDTH // 2, GRID_HEIGHT // 2)])
+        self.occupy(*self.snake[0])
         self.direction = (1, 0)
+        self.turns = deque()
         self.food = self.spawn_food()
         self.score = 0
         self.game_over = False
-    
-    def run(self):
-        running = True
-        while running:
-            running = self.handle_events()
-            self.update()
-            self.draw()
-            self.clock.tick(FPS)
-        
-        pygame.quit()
-        sys.exit()
+        self.move_timer = 0
+        # Jogo novo: o tabuleiro inteiro é repintado
+        self.pending = []
+        self.drawn_score = None
+        self.renderer.invalidate()
 
 if __name__ == "__main__":
-    game = SnakeGame()
-    game.run()
+    SnakeGame.interpolate = "--interpolate" in sys.argv
+    main(SnakeGame)
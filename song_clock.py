@@ -0,0 +1,58 @@
+import time
+
+import pygame
+
+
+class SongClock:
+    """Tempo da música em segundos.
+
+    Com um arquivo de áudio, segue a posição de reprodução do mixer
+    (pygame.mixer.music.get_pos). Essa posição anda aos saltos, do tamanho
+    do buffer de áudio, então entre um salto e outro o tempo é completado
+    pelo relógio de alta resolução. Sem áudio (ou sem mixer), é o relógio
+    de parede desde play(). Em nenhum dos casos o tempo volta para trás.
+    """
+
+    def __init__(self, audio_path=None):
+        self.audio_path = audio_path
+        self.audio = False
+        self.start = None
+        self.last_pos = None
+        self.last_pos_at = 0.0
+        self.last_time = 0.0
+
+    def play(self):
+        if self.audio_path and pygame.mixer.get_init():
+            try:
+                pygame.mixer.music.load(self.audio_path)
+                pygame.mixer.music.play()
+                self.audio = True
+            except pygame.error as e:
+                print(f"Error playing {self.audio_path}: {e}")
+        self.start = time.perf_counter()
+
+    @property
+    def started(self):
+        return self.start is not None
+
+    def now(self):
+        if self.start is None:
+            return 0.0
+        now = time.perf_counter()
+        song_time = now - self.start
+
+        if self.audio:
+            pos = pygame.mixer.music.get_pos()
+            if pos >= 0:
+                if pos != self.last_pos:
+                    self.last_pos = pos
+                    self.last_pos_at = now
+                song_time = pos / 1000.0 + (now - self.last_pos_at)
+
+        self.last_time = max(self.last_time, song_time)
+        return self.last_time
+
+    def stop(self):
+        if self.audio:
+            pygame.mixer.music.stop()
+            self.audio = False
@@ -0,0 +1,194 @@
+import os
+import sys
+import time
+import random
+import argparse
+
+if __name__ == "__main__" and "--attract" not in sys.argv:
+    # Benchmark sem tela
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from game_base import main
+from text_cache import render_text
+from tetris_game import TetrisGame, GRID_WIDTH, GRID_HEIGHT, FULL_ROW, WHITE
+
+# Pesos de uma heurística linear clássica (altura, linhas, buracos, irregularidade)
+WEIGHTS = {"height": -0.51, "lines": 0.76, "holes": -0.36, "bumpiness": -0.18}
+
+ATTRACT_MOVE_INTERVAL = 0.08  # segundos entre movimentos da peça na demonstração
+
+
+def column_heights(rows):
+    heights = [0] * GRID_WIDTH
+    seen = 0
+    for y, row in enumerate(rows):
+        new = row & ~seen
+        while new:
+            bit = new & -new
+            heights[bit.bit_length() - 1] = GRID_HEIGHT - y
+            new ^= bit
+        seen |= row
+        if seen == FULL_ROW:
+            break
+    return heights
+
+
+def count_holes(rows):
+    # Célula vazia com algum bloco acima dela na mesma coluna
+    holes = 0
+    covered = 0
+    for row in rows:
+        holes += (~row & covered & FULL_ROW).bit_count()
+        covered |= row
+    return holes
+
+
+def default_heuristic(rows, lines):
+    heights = column_heights(rows)
+    bumpiness = sum(abs(a - b) for a, b in zip(heights, heights[1:]))
+    return (WEIGHTS["height"] * sum(heights) + WEIGHTS["lines"] * lines
+            + WEIGHTS["holes"] * count_holes(rows) + WEIGHTS["bumpiness"] * bumpiness)
+
+
+def drop(rows, masks, x, y):
+    # Tabuleiro resultante de fixar a peça em (x, y), já sem as linhas completas
+    rows = list(rows)
+    for i, mask in enumerate(masks):
+        if y + i >= 0:
+            rows[y + i] |= mask << x
+    kept = [row for row in rows if row != FULL_ROW]
+    cleared = GRID_HEIGHT - len(kept)
+    return [0] * cleared + kept, cleared
+
+
+def placements(game, piece):
+    """Toda rotação e coluna em que a peça cabe na altura onde nasceu, com a
+    peça caindo reto até parar.
+
+    Limite: não há busca de movimentos depois da queda, então encaixes que
+    pedem deslizar por baixo de uma saliência ou girar no fundo (slides e
+    tucks) nunca são considerados. Isso combina com a demonstração, que
+    executa a jogada como girar, andar de lado e cair.
+    """
+    for rotation, (masks, width) in enumerate(piece.rotations):
+        for x in range(GRID_WIDTH - width + 1):
+            if not game.fits(masks, width, x, piece.y):
+                continue
+            y = piece.y
+            while game.fits(masks, width, x, y + 1):
+                y += 1
+            yield rotation, x, y
+
+
+class TetrisBot:
+    """Escolhe onde colocar cada peça. A heurística recebe o tabuleiro
+    resultante (lista de linhas em bits) e quantas linhas a jogada completou,
+    e devolve uma nota: maior é melhor."""
+
+    def __init__(self, heuristic=default_heuristic):
+        self.heuristic = heuristic
+
+    def choose(self, game, piece):
+        best = None
+        best_score = None
+        for rotation, x, y in placements(game, piece):
+            masks, _ = piece.rotations[rotation]
+            rows, cleared = drop(game.rows, masks, x, y)
+            score = self.heuristic(rows, cleared)
+            if best_score is None or score > best_score:
+                best, best_score = (rotation, x, y), score
+        return best
+
+    def play_piece(self, game):
+        placement = self.choose(game, game.current_piece)
+        if placement is None:
+            game.game_over = True
+            return
+        piece = game.current_piece
+        piece.rotation, piece.x, piece.y = placement
+        game.lock_piece()
+
+    def play(self, game, max_pieces=None):
+        pieces = 0
+        while not game.game_over and (max_pieces is None or pieces < max_pieces):
+            self.play_piece(game)
+            pieces += 1
+        return pieces
+
+
+class TetrisAttract(TetrisGame):
+    """Demonstração para quiosque parado: o robô joga na tela até alguém
+    apertar uma tecla ou clicar."""
+
+    caption = "Tétris Simples - Demonstração"
+
+    def init(self):
+        super().init()
+        self.bot = TetrisBot()
+        self.planned_piece = None
+        self.target = None
+        self.move_time = 0
+
+    def handle_event(self, event):
+        if event.type == pygame.QUIT:
+            return False
+        if event.type in (pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN):
+            return False
+        return True
+
+    def update(self, dt):
+        if self.game_over:
+            self.reset_game()
+
+        piece = self.current_piece
+        if self.planned_piece is not piece:
+            self.planned_piece = piece
+            self.target = self.bot.choose(self, piece)
+
+        self.move_time += dt
+        if self.target is not None and self.move_time >= ATTRACT_MOVE_INTERVAL:
+            self.move_time = 0
+            rotation, x, _ = self.target
+            if piece.rotation != rotation and self.is_valid_position(piece, rotation=piece.rotation + 1):
+                piece.rotate()
+            elif piece.x != x and self.is_valid_position(piece, dx=1 if x > piece.x else -1):
+                piece.x += 1 if x > piece.x else -1
+            elif self.is_valid_position(piece, dy=1):
+                piece.y += 1
+
+        super().update(dt)
+
+    def draw(self):
+        super().draw()
+        text = render_text("DEMONSTRAÇÃO - aperte qualquer tecla", 24, WHITE)
+        self.mark(self.screen.blit(text, (20, self.screen.get_height() - 40)))
+
+
+def benchmark(games, max_pieces):
+    bot = TetrisBot()
+    pieces = lines = 0
+    start = time.perf_counter()
+    for _ in range(games):
+        game = TetrisGame.headless()
+        pieces += bot.play(game, max_pieces)
+        lines += game.lines_cleared
+    elapsed = time.perf_counter() - start
+    return pieces, lines, elapsed
+
+
+if __name__ == "__main__":
+    if "--attract" in sys.argv:
+        main(TetrisAttract)
+
+    parser = argparse.ArgumentParser(description="Robô de Tétris sem tela: mede peças/s e linhas/s")
+    parser.add_argument("--games", type=int, default=5)
+    parser.add_argument("--max-pieces", type=int, default=2000, help="limite de peças por partida")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    pieces, lines, elapsed = benchmark(args.games, args.max_pieces)
+    print(f"{args.games} games: {pieces} pieces, {lines} lines in {elapsed:.2f} s "
+          f"({pieces / elapsed:.0f} pieces/s, {lines / elapsed:.0f} lines/s)")
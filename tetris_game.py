@@ -1,7 +1,10 @@
 import pygame
-import sys
 import random
 
+from game_base import Game, main
+from renderer import display_format
+from text_cache import render_text
+
 pygame.init()
 
 # Configurar para tela cheia (modo janela)
@@ -24,6 +27,83 @@ GRAY = (128, 128, 128)
 
 GAME_AREA_X = int(WINDOW_WIDTH * 0.05)
 GAME_AREA_Y = int(WINDOW_HEIGHT * 0.05)
+PANEL_X = GAME_AREA_X + GRID_WIDTH * BLOCK_SIZE + 20
+
+# Define shapes (4 simple pieces)
+SHAPES = {
+    'I': (  # Line piece (Blue)
+        (
+            (1, 1, 1, 1),
+        ),
+        (
+            (1,),
+            (1,),
+            (1,),
+            (1,)
+        )
+    ),
+    'O': (  # Square piece (Yellow)
+        (
+            (1, 1),
+            (1, 1)
+        ),
+    ),
+    'L': (  # L piece (Green)
+        (
+            (1, 0),
+            (1, 0),
+            (1, 1)
+        ),
+        (
+            (1, 1, 1),
+            (1, 0, 0)
+        ),
+        (
+            (1, 1),
+            (0, 1),
+            (0, 1)
+        ),
+        (
+            (0, 0, 1),
+            (1, 1, 1)
+        )
+    ),
+    'T': (  # T piece (Red)
+        (
+            (0, 1, 0),
+            (1, 1, 1)
+        ),
+        (
+            (1, 0),
+            (1, 1),
+            (1, 0)
+        ),
+        (
+            (1, 1, 1),
+            (0, 1, 0)
+        ),
+        (
+            (0, 1),
+            (1, 1),
+            (0, 1)
+        )
+    )
+}
+
+# Tabuleiro em bits: cada linha é um int, bit x = coluna x
+FULL_ROW = (1 << GRID_WIDTH) - 1
+
+def row_mask(row):
+    return sum(1 << x for x, cell in enumerate(row) if cell)
+
+# Por peça e rotação: (máscaras das linhas, largura), calculado uma vez
+ROTATIONS = {
+    shape_type: tuple((tuple(row_mask(row) for row in shape), len(shape[0])) for shape in shapes)
+    for shape_type, shapes in SHAPES.items()
+}
+
+# Plano de cores: índice nesta lista, 0 = vazio
+COLORS = [BLACK, BLUE, YELLOW, GREEN, RED]
 
 class TetrisPiece:
     def __init__(self, shape_type, color):
@@ -32,83 +112,19 @@ class TetrisPiece:
         self.rotation = 0
         self.x = GRID_WIDTH // 2 - 1
         self.y = 0
-        
-        # Define shapes (4 simple pieces)
-        self.shapes = {
-            'I': [  # Line piece (Blue)
-                [
-                    [1, 1, 1, 1]
-                ],
-                [
-                    [1],
-                    [1],
-                    [1],
-                    [1]
-                ]
-            ],
-            'O': [  # Square piece (Yellow)
-                [
-                    [1, 1],
-                    [1, 1]
-                ]
-            ],
-            'L': [  # L piece (Green)
-                [
-                    [1, 0],
-                    [1, 0],
-                    [1, 1]
-                ],
-                [
-                    [1, 1, 1],
-                    [1, 0, 0]
-                ],
-                [
-                    [1, 1],
-                    [0, 1],
-                    [0, 1]
-                ],
-                [
-                    [0, 0, 1],
-                    [1, 1, 1]
-                ]
-            ],
-            'T': [  # T piece (Red)
-                [
-                    [0, 1, 0],
-                    [1, 1, 1]
-                ],
-                [
-                    [1, 0],
-                    [1, 1],
-                    [1, 0]
-                ],
-                [
-                    [1, 1, 1],
-                    [0, 1, 0]
-                ],
-                [
-                    [0, 1],
-                    [1, 1],
-                    [0, 1]
-                ]
-            ]
-        }
+        self.rotations = ROTATIONS[shape_type]
     
     def get_shape(self):
-        return self.shapes[self.shape_type][self.rotation % len(self.shapes[self.shape_type])]
+        return SHAPES[self.shape_type][self.rotation % len(self.rotations)]
     
     def rotate(self):
-        self.rotation = (self.rotation + 1) % len(self.shapes[self.shape_type])
+        self.rotation = (self.rotation + 1) % len(self.rotations)
 
-class TetrisGame:
-    def __init__(self):
-        self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT), pygame.FULLSCREEN)
-        pygame.display.set_caption("Tétris Simples")
-        self.clock = pygame.time.Clock()
-        
-        self.grid = [[0 for _ in range(GRID_WIDTH)] for _ in range(GRID_HEIGHT)]
-        self.grid_colors = [[BLACK for _ in range(GRID_WIDTH)] for _ in range(GRID_HEIGHT)]
-        
+class TetrisGame(Game):
+    caption = "Tétris Simples"
+    fps = FPS
+
+    def init(self):
         self.piece_types = [
             ('I', BLUE),
             ('O', YELLOW),
@@ -116,154 +132,163 @@ class TetrisGame:
             ('T', RED)
         ]
         
-        self.current_piece = self.spawn_piece()
-        self.fall_time = 0
-        self.fall_speed = 500  # milliseconds
-        self.score = 0
-        self.lines_cleared = 0
-        self.game_over = False
-        
-        self.font = pygame.font.Font(None, 36)
-        self.small_font = pygame.font.Font(None, 24)
+        self.reset_game()
     
     def spawn_piece(self):
         piece_type, color = random.choice(self.piece_types)
         return TetrisPiece(piece_type, color)
     
+    def fits(self, masks, width, x, y):
+        if x < 0 or x + width > GRID_WIDTH:
+            return False
+        rows = self.rows
+        for i, mask in enumerate(masks):
+            row = y + i
+            if row >= GRID_HEIGHT:
+                return False
+            if row >= 0 and rows[row] & (mask << x):
+                return False
+        return True
+    
     def is_valid_position(self, piece, dx=0, dy=0, rotation=None):
         if rotation is None:
-            shape = piece.get_shape()
-        else:
-            old_rotation = piece.rotation
-            piece.rotation = rotation % len(piece.shapes[piece.shape_type])
-            shape = piece.get_shape()
-            piece.rotation = old_rotation
-        
-        for y, row in enumerate(shape):
-            for x, cell in enumerate(row):
-                if cell:
-                    new_x = piece.x + x + dx
-                    new_y = piece.y + y + dy
-                    
-                    if (new_x < 0 or new_x >= GRID_WIDTH or 
-                        new_y >= GRID_HEIGHT or
-                        (new_y >= 0 and self.grid[new_y][new_x])):
-                        return False
-        return True
+            rotation = piece.rotation
+        masks, width = piece.rotations[rotation % len(piece.rotations)]
+        return self.fits(masks, width, piece.x + dx, piece.y + dy)
     
     def place_piece(self, piece):
-        shape = piece.get_shape()
-        for y, row in enumerate(shape):
-            for x, cell in enumerate(row):
-                if cell:
-                    grid_x = piece.x + x
-                    grid_y = piece.y + y
-                    if grid_y >= 0:
-                        self.grid[grid_y][grid_x] = 1
-                        self.grid_colors[grid_y][grid_x] = piece.color
+        masks, width = piece.rotations[piece.rotation % len(piece.rotations)]
+        color = COLORS.index(piece.color)
+        for i, mask in enumerate(masks):
+            row = piece.y + i
+            if row < 0:
+                continue
+            self.rows[row] |= mask << piece.x
+            for x in range(width):
+                if mask >> x & 1:
+                    self.colors[row * GRID_WIDTH + piece.x + x] = color
+        self.board = None
     
     def clear_lines(self):
-        lines_to_clear = []
-        for y in range(GRID_HEIGHT):
-            if all(self.grid[y]):
-                lines_to_clear.append(y)
+        # Compactação em uma passada: só as linhas incompletas sobrevivem
+        kept = [y for y in range(GRID_HEIGHT) if self.rows[y] != FULL_ROW]
+        cleared = GRID_HEIGHT - len(kept)
         
-        for y in lines_to_clear:
-            del self.grid[y]
-            del self.grid_colors[y]
-            self.grid.insert(0, [0 for _ in range(GRID_WIDTH)])
-            self.grid_colors.insert(0, [BLACK for _ in range(GRID_WIDTH)])
-        
-        if lines_to_clear:
-            self.lines_cleared += len(lines_to_clear)
-            self.score += len(lines_to_clear) * 100 * (len(lines_to_clear))  # Bonus for multiple lines
+        if cleared:
+            self.rows = [0] * cleared + [self.rows[y] for y in kept]
+            self.colors = bytearray(cleared * GRID_WIDTH) + b"".join(
+                self.colors[y * GRID_WIDTH:(y + 1) * GRID_WIDTH] for y in kept)
+            self.board = None
+            
+            self.lines_cleared += cleared
+            self.score += cleared * 100 * cleared  # Bonus for multiple lines
             
             # Speed up game as lines are cleared
             if self.lines_cleared > 0 and self.lines_cleared % 5 == 0:
                 self.fall_speed = max(100, self.fall_speed - 50)
     
-    def handle_events(self):
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
+    def handle_event(self, event):
+        if event.type == pygame.QUIT:
+            return False
+        
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_ESCAPE:
                 return False
-            
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
-                    return False
-                elif self.game_over:
-                    if event.key == pygame.K_SPACE:
-                        self.reset_game()
-                else:
-                    if event.key == pygame.K_LEFT:
-                        if self.is_valid_position(self.current_piece, dx=-1):
-                            self.current_piece.x -= 1
+            elif self.game_over:
+                if event.key == pygame.K_SPACE:
+                    self.reset_game()
+            else:
+                if event.key == pygame.K_LEFT:
+                    if self.is_valid_position(self.current_piece, dx=-1):
+                        self.current_piece.x -= 1
 
-                    elif event.key == pygame.K_RIGHT:
-                        if self.is_valid_position(self.current_piece, dx=1):
-                            self.current_piece.x += 1
+                elif event.key == pygame.K_RIGHT:
+                    if self.is_valid_position(self.current_piece, dx=1):
+                        self.current_piece.x += 1
 
-                    elif event.key == pygame.K_DOWN:
-                        new_rotation = (self.current_piece.rotation + 1) % len(self.current_piece.shapes[self.current_piece.shape_type])
-                        if self.is_valid_position(self.current_piece, rotation=new_rotation):
-                            self.current_piece.rotate()
+                elif event.key == pygame.K_DOWN:
+                    if self.is_valid_position(self.current_piece, rotation=self.current_piece.rotation + 1):
+                        self.current_piece.rotate()
+
+                elif event.key == pygame.K_UP:
+                    if self.is_valid_position(self.current_piece, dy=1):
+                        self.current_piece.y += 1
+                        self.score += 1
 
-                    elif event.key == pygame.K_UP:
-                        if self.is_valid_position(self.current_piece, dy=1):
-                            self.current_piece.y += 1
-                            self.score += 1
-        
         return True
     
     def update(self, dt):
         if self.game_over:
             return
             
-        self.fall_time += dt
+        self.fall_time += dt * 1000
         
         if self.fall_time >= self.fall_speed:
             if self.is_valid_position(self.current_piece, dy=1):
                 self.current_piece.y += 1
             else:
-                self.place_piece(self.current_piece)
-                self.clear_lines()
-                self.current_piece = self.spawn_piece()
-                
-                if not self.is_valid_position(self.current_piece):
-                    self.game_over = True
+                self.lock_piece()
             
             self.fall_time = 0
     
-    def draw_grid(self):
+    def lock_piece(self):
+        self.place_piece(self.current_piece)
+        self.clear_lines()
+        self.current_piece = self.spawn_piece()
+        
+        if not self.is_valid_position(self.current_piece):
+            self.game_over = True
+    
+    def draw_grid_lines(self, surface, left, top):
         # Draw game area background
-        game_rect = pygame.Rect(GAME_AREA_X, GAME_AREA_Y, GRID_WIDTH * BLOCK_SIZE, GRID_HEIGHT * BLOCK_SIZE)
-        pygame.draw.rect(self.screen, BLACK, game_rect)
-        pygame.draw.rect(self.screen, WHITE, game_rect, 2)
+        game_rect = pygame.Rect(left, top, GRID_WIDTH * BLOCK_SIZE, GRID_HEIGHT * BLOCK_SIZE)
+        pygame.draw.rect(surface, BLACK, game_rect)
+        pygame.draw.rect(surface, WHITE, game_rect, 2)
         
+        # Draw grid lines
+        for x in range(GRID_WIDTH + 1):
+            start_x = left + x * BLOCK_SIZE
+            pygame.draw.line(surface, GRAY, 
+                           (start_x, top), 
+                           (start_x, top + GRID_HEIGHT * BLOCK_SIZE))
+        
+        for y in range(GRID_HEIGHT + 1):
+            start_y = top + y * BLOCK_SIZE
+            pygame.draw.line(surface, GRAY,
+                           (left, start_y),
+                           (left + GRID_WIDTH * BLOCK_SIZE, start_y))
+
+    def draw_grid(self, surface, left, top):
         # Draw placed blocks
         for y in range(GRID_HEIGHT):
+            if not self.rows[y]:
+                continue
             for x in range(GRID_WIDTH):
-                if self.grid[y][x]:
+                color = self.colors[y * GRID_WIDTH + x]
+                if color:
                     rect = pygame.Rect(
-                        GAME_AREA_X + x * BLOCK_SIZE,
-                        GAME_AREA_Y + y * BLOCK_SIZE,
+                        left + x * BLOCK_SIZE,
+                        top + y * BLOCK_SIZE,
                         BLOCK_SIZE,
                         BLOCK_SIZE
                     )
-                    pygame.draw.rect(self.screen, self.grid_colors[y][x], rect)
-                    pygame.draw.rect(self.screen, BLACK, rect, 1)
-        
-        # Draw grid lines
-        for x in range(GRID_WIDTH + 1):
-            start_x = GAME_AREA_X + x * BLOCK_SIZE
-            pygame.draw.line(self.screen, GRAY, 
-                           (start_x, GAME_AREA_Y), 
-                           (start_x, GAME_AREA_Y + GRID_HEIGHT * BLOCK_SIZE))
-        
-        for y in range(GRID_HEIGHT + 1):
-            start_y = GAME_AREA_Y + y * BLOCK_SIZE
-            pygame.draw.line(self.screen, GRAY,
-                           (GAME_AREA_X, start_y),
-                           (GAME_AREA_X + GRID_WIDTH * BLOCK_SIZE, start_y))
+                    pygame.draw.rect(surface, COLORS[color], rect)
+                    pygame.draw.rect(surface, BLACK, rect, 1)
+
+    def build_board(self):
+        # Tabuleiro com as peças fixas, refeito só quando uma peça trava ou linhas somem
+        board = display_format(pygame.Surface((GRID_WIDTH * BLOCK_SIZE + 1, GRID_HEIGHT * BLOCK_SIZE + 1)))
+        self.draw_grid_lines(board, 0, 0)
+        self.draw_grid(board, 0, 0)
+        return board
+
+    def build_panel(self):
+        # Pontuação e linhas, refeitas só quando mudam; o fundo preto apaga o texto anterior
+        panel = pygame.Surface((WINDOW_WIDTH - PANEL_X, 60))
+        panel.fill(BLACK)
+        panel.blit(render_text(f"Pontuação: {self.score}", 24, WHITE), (0, 0))
+        panel.blit(render_text(f"Linhas: {self.lines_cleared}", 24, WHITE), (0, 30))
+        return panel
     
     def draw_piece(self, piece):
         shape = piece.get_shape()
@@ -276,22 +301,14 @@ class TetrisGame:
                         BLOCK_SIZE,
                         BLOCK_SIZE
                     )
-                    pygame.draw.rect(self.screen, piece.color, rect)
+                    self.mark(pygame.draw.rect(self.screen, piece.color, rect))
                     pygame.draw.rect(self.screen, BLACK, rect, 1)
-    
-    def draw_ui(self):
-        # Title
-        title = self.font.render("Tétris Simples", True, WHITE)
-        self.screen.blit(title, (GAME_AREA_X + GRID_WIDTH * BLOCK_SIZE + 20, 50))
 
-        # Score
-        score_text = self.small_font.render(f"Pontuação: {self.score}", True, WHITE)
-        self.screen.blit(score_text, (GAME_AREA_X + GRID_WIDTH * BLOCK_SIZE + 20, 100))
+    def draw_static_ui(self, surface):
+        # Title
+        title = render_text("Tétris Simples", 36, WHITE)
+        surface.blit(title, (PANEL_X, 50))
 
-        # Lines
-        lines_text = self.small_font.render(f"Linhas: {self.lines_cleared}", True, WHITE)
-        self.screen.blit(lines_text, (GAME_AREA_X + GRID_WIDTH * BLOCK_SIZE + 20, 130))
-        
         # Controls (standardized: ↑ Amarelo, ← Vermelho, ↓ Azul, → Verde)
         controls = [
             "← (Vermelho) Esquerda",
@@ -301,8 +318,8 @@ class TetrisGame:
         ]
         
         for i, control in enumerate(controls):
-            text = pygame.font.Font(None, 18).render(control, True, WHITE)
-            self.screen.blit(text, (GAME_AREA_X + GRID_WIDTH * BLOCK_SIZE + 20, 200 + i * 25))
+            text = render_text(control, 18, WHITE)
+            surface.blit(text, (PANEL_X, 200 + i * 25))
         
         # Piece colors
         color_info = [
@@ -313,47 +330,55 @@ class TetrisGame:
         ]
         
         for i, (name, color) in enumerate(color_info):
-            text = pygame.font.Font(None, 18).render(name, True, color)
-            self.screen.blit(text, (GAME_AREA_X + GRID_WIDTH * BLOCK_SIZE + 20, 350 + i * 25))
+            text = render_text(name, 18, color)
+            surface.blit(text, (PANEL_X, 350 + i * 25))
+    
+    def draw_ui(self):
+        # Score and lines
+        panel_key = (self.score, self.lines_cleared)
+        if panel_key != self.panel_key:
+            self.panel = self.build_panel()
+            self.panel_key = panel_key
+            self.mark(self.screen.blit(self.panel, (PANEL_X, 100)))
+        else:
+            self.screen.blit(self.panel, (PANEL_X, 100))
         
         if self.game_over:
-            game_over_text = self.font.render("FIM DE JOGO", True, RED)
-            restart_text = self.small_font.render("Pressione ESPAÇO para reiniciar", True, WHITE)
+            game_over_text = render_text("FIM DE JOGO", 36, RED)
+            restart_text = render_text("Pressione ESPAÇO para reiniciar", 24, WHITE)
             
-            self.screen.blit(game_over_text, (GAME_AREA_X + GRID_WIDTH * BLOCK_SIZE + 20, 500))
-            self.screen.blit(restart_text, (GAME_AREA_X + GRID_WIDTH * BLOCK_SIZE + 20, 540))
+            self.mark(self.screen.blit(game_over_text, (PANEL_X, 500)))
+            self.mark(self.screen.blit(restart_text, (PANEL_X, 540)))
     
     def reset_game(self):
-        self.grid = [[0 for _ in range(GRID_WIDTH)] for _ in range(GRID_HEIGHT)]
-        self.grid_colors = [[BLACK for _ in range(GRID_WIDTH)] for _ in range(GRID_HEIGHT)]
+        self.rows = [0] * GRID_HEIGHT
+        self.colors = bytearray(GRID_WIDTH * GRID_HEIGHT)
         self.current_piece = self.spawn_piece()
         self.fall_time = 0
         self.fall_speed = 500
         self.score = 0
         self.lines_cleared = 0
         self.game_over = False
+        self.board = None
+        self.panel = None
+        self.panel_key = None
     
+    def draw_static(self, surface):
+        surface.fill(BLACK)
+        self.draw_static_ui(surface)
+
     def draw(self):
-        self.screen.fill(BLACK)
-        self.draw_grid()
+        # O tabuleiro é copiado todo frame, mas só vai para a tela quando muda
+        if self.board is None:
+            self.board = self.build_board()
+            self.mark(self.screen.blit(self.board, (GAME_AREA_X, GAME_AREA_Y)))
+        else:
+            self.screen.blit(self.board, (GAME_AREA_X, GAME_AREA_Y))
         
         if not self.game_over:
             self.draw_piece(self.current_piece)
         
         self.draw_ui()
-        pygame.display.flip()
-    
-    def run(self):
-        running = True
-        while running:
-            dt = self.clock.tick(FPS)
-            running = self.handle_events()
-            self.update(dt)
-            self.draw()
-        
-        pygame.quit()
-        sys.exit()
 
 if __name__ == "__main__":
-    game = TetrisGame()
-    game.run()
\ No newline at end of file
+    main(TetrisGame)
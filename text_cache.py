@@ -0,0 +1,67 @@
+import pygame
+from collections import OrderedDict
+
+pygame.font.init()
+
+MAX_SURFACES = 512
+
+
+class TextCache:
+    """Cache de fontes por tamanho e de textos já renderizados, com LRU.
+
+    As superfícies devolvidas são compartilhadas: só devem ser desenhadas
+    (blit), nunca alteradas.
+    """
+
+    def __init__(self, max_surfaces=MAX_SURFACES):
+        self.max_surfaces = max_surfaces
+        self.fonts = {}
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get_font(self, size):
+        font = self.fonts.get(size)
+        if font is None:
+            font = pygame.font.Font(None, size)
+            self.fonts[size] = font
+        return font
+
+    def render(self, text, size, color, antialias=True):
+        key = (text, size, tuple(color), antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = self.get_font(size).render(text, antialias, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_surfaces:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self.surfaces.clear()
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "fonts": len(self.fonts),
+            "surfaces": len(self.surfaces)
+        }
+
+
+text_cache = TextCache()
+
+
+def get_font(size):
+    return text_cache.get_font(size)
+
+
+def render_text(text, size, color, antialias=True):
+    return text_cache.render(text, size, color, antialias)
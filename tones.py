@@ -0,0 +1,91 @@
+import os
+
+import numpy as np
+import pygame
+
+import audio
+
+# Notas das cores (Hz)
+NOTES = {
+    "yellow": 440.0,   # Lá 4
+    "red": 523.25,     # Dó 5
+    "blue": 392.0,     # Sol 4
+    "green": 783.99,   # Sol 5
+}
+GAME_OVER = (110.0, 1.0, "square")  # frequência, duração (s) e forma de onda
+
+VOLUME = 0.5
+FADE = 0.005  # segundos de rampa no início e no fim, para não estalar
+
+# Diretório para guardar as amostras entre execuções (opcional)
+CACHE_DIR = os.environ.get("TONE_CACHE")
+
+DTYPES = {-8: np.int8, 8: np.uint8, -16: np.int16, 16: np.uint16, -32: np.int32, 32: np.float32}
+
+cache = {}
+
+
+def synthesize(frequency, duration, sample_rate, wave="sine"):
+    """Amostras mono em float entre -1 e 1, com rampas nas pontas."""
+    t = np.arange(int(duration * sample_rate)) / sample_rate
+    samples = np.sin(2 * np.pi * frequency * t)
+    if wave == "square":
+        samples = np.sign(samples)
+
+    fade = min(int(FADE * sample_rate), len(samples) // 2)
+    if fade:
+        ramp = np.linspace(0.0, 1.0, fade)
+        samples[:fade] *= ramp
+        samples[-fade:] *= ramp[::-1]
+    return samples * VOLUME
+
+
+def cached_samples(frequency, duration, sample_rate, wave):
+    if not CACHE_DIR:
+        return synthesize(frequency, duration, sample_rate, wave)
+
+    path = os.path.join(CACHE_DIR, f"{wave}_{frequency:g}_{duration:g}_{sample_rate}.npy")
+    try:
+        return np.load(path)
+    except (OSError, ValueError):
+        pass
+    samples = synthesize(frequency, duration, sample_rate, wave)
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        np.save(path, samples)
+    except OSError as e:
+        print(f"Aviso: não foi possível gravar o tom em {path}: {e}")
+    return samples
+
+
+def tone(frequency, duration, wave="sine"):
+    """Som sintetizado no formato do mixer, criado uma vez por (frequência,
+    duração, taxa de amostragem, forma de onda); None sem áudio ou com
+    audio.muted."""
+    if audio.muted or not audio.init():
+        return None
+    sample_rate, size, channels = pygame.mixer.get_init()
+    key = (frequency, duration, sample_rate, wave)
+    sound = cache.get(key)
+    if sound is None:
+        samples = cached_samples(frequency, duration, sample_rate, wave)
+        dtype = DTYPES[size]
+        if size == 32:
+            data = samples
+        else:
+            # Inteiros: escala para a faixa do formato (sem sinal = centrado no meio)
+            scale = 2 ** (abs(size) - 1) - 1
+            data = samples * scale + (0 if size < 0 else scale + 1)
+        data = data.astype(dtype)
+        if channels > 1:
+            data = np.repeat(data[:, None], channels, axis=1)
+        sound = pygame.sndarray.make_sound(np.ascontiguousarray(data))
+        cache[key] = sound
+    return sound
+
+
+def note(name, duration):
+    # Tom de uma cor (ver NOTES) ou do fim de jogo ("game_over")
+    if name == "game_over":
+        return tone(*GAME_OVER)
+    return tone(NOTES[name], duration)